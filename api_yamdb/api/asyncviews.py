@@ -0,0 +1,60 @@
+"""Async-вью чтения для запуска под ASGI.
+
+Синхронные вью под ASGI в Django 3.2 выполняются через
+`sync_to_async(thread_sensitive=True)` в одном общем потоке процесса:
+пока один запрос ждет базу, остальные стоят в очереди к этому потоку.
+Асинхронного ORM (`aget`, `acount`, `aiterator`) в Django 3.2 еще нет,
+поэтому AsyncReadMixin отдает для list и retrieve async-вью, которая
+выполняет обычный код DRF — запросы к базе, пагинацию и сериализацию —
+одним переходом в пул потоков (`thread_sensitive=False`). Запросы
+чтения идут параллельно, а ожидающие свободного потока ждут корутинами
+в цикле событий, не занимая потоков. Изменяющие запросы выполняются
+в общем потоке, как и раньше.
+
+Включается настройкой `API_ASYNC_READS`, которая читается при импорте
+URL. Под WSGI ее включать не стоит: там Django оборачивает async-вью
+в async_to_sync, и каждое чтение стоит лишнего цикла событий.
+"""
+from functools import partial, update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+READ_ACTIONS = ('list', 'retrieve')
+READ_METHODS = ('GET', 'HEAD')
+
+
+def read_in_thread(view, request, *args, **kwargs):
+    """Выполняет вью в потоке пула и закрывает его устаревшие соединения.
+
+    Сигнал request_finished закрывает соединения только общего потока,
+    поэтому соединения потоков пула живут по CONN_MAX_AGE здесь.
+    """
+    try:
+        return view(request, *args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class AsyncReadMixin:
+    """list и retrieve вьюсета как async-вью при API_ASYNC_READS."""
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if (not getattr(settings, 'API_ASYNC_READS', False)
+                or actions.get('get') not in READ_ACTIONS):
+            return view
+        read = sync_to_async(
+            partial(read_in_thread, view), thread_sensitive=False
+        )
+        write = sync_to_async(view, thread_sensitive=True)
+
+        async def async_view(request, *args, **kwargs):
+            if request.method in READ_METHODS:
+                return await read(request, *args, **kwargs)
+            return await write(request, *args, **kwargs)
+
+        # cls, actions, initkwargs и csrf_exempt нужны роутеру и Django.
+        return update_wrapper(async_view, view)
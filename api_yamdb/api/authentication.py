@@ -0,0 +1,151 @@
+"""JWT-аутентификация без запроса пользователя к базе.
+
+`access_token_for` кладет в access-токен id, username, role, is_staff,
+is_active и token_version — все, что нужно классам прав доступа
+и проверке отзыва; неактивным пользователям токены не выдаются.
+StatelessJWTAuthentication собирает по ним экземпляр пользователя
+с отложенными остальными полями, так что запрос к базе будет, только
+если кто-то обратится, например, к email. Токены без этих claims,
+выданные раньше, проверяются по базе, как в JWTAuthentication.
+
+Изменение username, роли, is_staff или is_active, в том числе
+массовое, увеличивает `token_version` пользователя в базе, и токены
+со старой версией отклоняются; токены удаленного пользователя
+отклоняются, потому что его версии в базе нет. Версии кешируются
+в памяти процесса на `API_TOKEN_VERSION_TIMEOUT` секунд: свой процесс
+забывает версию сразу после коммита, а в остальных отзыв действует
+не позже, чем через этот срок. Вытесненная или устаревшая запись
+перечитывается из базы, так что кеш не может вернуть отозванный токен
+к жизни.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+USER_CLAIMS = ('username', 'role', 'is_staff', 'is_active', 'token_version')
+TOKEN_VERSION_TIMEOUT = 30
+
+
+class TokenVersions:
+    """Версии токенов пользователей в памяти процесса.
+
+    Хранится не больше `max_keys` версий: при переполнении выбрасывается
+    давно не использованная, и следующая проверка прочитает ее из базы.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.versions = OrderedDict()
+
+    def get(self, user_id):
+        """Текущая версия или None, если пользователя нет."""
+        now = time.monotonic()
+        with self.lock:
+            cached = self.versions.get(user_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        version = get_user_model().objects.filter(pk=user_id).values_list(
+            'token_version', flat=True
+        ).first()
+        if version is not None:
+            self.remember(user_id, version, now)
+        return version
+
+    def remember(self, user_id, version, now=None, replace=True):
+        timeout = getattr(
+            settings, 'API_TOKEN_VERSION_TIMEOUT', TOKEN_VERSION_TIMEOUT
+        )
+        expires = (now or time.monotonic()) + timeout
+        with self.lock:
+            if replace or user_id not in self.versions:
+                self.versions[user_id] = (version, expires)
+            self.versions.move_to_end(user_id)
+            if len(self.versions) > self.max_keys:
+                self.versions.popitem(last=False)
+
+    def forget(self, *user_ids):
+        with self.lock:
+            for user_id in user_ids:
+                self.versions.pop(user_id, None)
+
+    def reset(self):
+        with self.lock:
+            self.versions.clear()
+
+
+token_versions = TokenVersions()
+
+
+def access_token_for(user):
+    if not user.is_active:
+        raise AuthenticationFailed(
+            'Пользователь неактивен.', code='user_inactive'
+        )
+    token = AccessToken.for_user(user)
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    # Токен только что выдан по этой версии: первая проверка обойдется
+    # без базы, а уже известную версию подсказка не заменит.
+    token_versions.remember(user.pk, user.token_version, replace=False)
+    return token
+
+
+def revoke_tokens(*user_ids):
+    """Отзывает все выданные токены пользователей."""
+    get_user_model().objects.filter(pk__in=user_ids).update(
+        token_version=F('token_version') + 1
+    )
+    forget_on_commit(*user_ids)
+
+
+def forget_on_commit(*user_ids):
+    """Забывает версии после коммита, чтобы не перечитать старые."""
+    transaction.on_commit(partial(token_versions.forget, *user_ids))
+
+
+def is_revoked(user_id, version):
+    return token_versions.get(user_id) != version
+
+
+def token_user(validated_token):
+    """Пользователь из claims токена, остальные поля отложены."""
+    model = get_user_model()
+    claims = {field: validated_token[field] for field in USER_CLAIMS}
+    claims[api_settings.USER_ID_FIELD] = validated_token[
+        api_settings.USER_ID_CLAIM
+    ]
+    fields = [field.attname for field in model._meta.concrete_fields
+              if field.attname in claims]
+    return model.from_db(
+        router.db_for_read(model), fields, [claims[name] for name in fields]
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Пользователь строится из claims access-токена без запроса к базе."""
+
+    def get_user(self, validated_token):
+        claims = USER_CLAIMS + (api_settings.USER_ID_CLAIM,)
+        if any(claim not in validated_token for claim in claims):
+            return super().get_user(validated_token)
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if is_revoked(user_id, validated_token['token_version']):
+            raise AuthenticationFailed(
+                'Токен отозван, получите новый.', code='token_revoked'
+            )
+        return token_user(validated_token)
@@ -0,0 +1,334 @@
+"""Подсказки по префиксу названий из индекса в памяти процесса.
+
+Индекс — отсортированный массив пар (ключ, pk), префикс ищется двумя
+bisect. Ключами служат хвосты названия от начала каждого слова, поэтому
+«войны» находит «Звездные войны». Индекс строится в фоновом потоке при
+старте процесса, обновляется обработчиками сигналов из `api.signals`
+после коммита и целиком перестраивается тем же потоком раз в
+`AUTOCOMPLETE_REBUILD_INTERVAL` секунд, чтобы процессы догоняли
+изменения, сделанные в других процессах. Запросы при этом отвечают
+по старому индексу.
+"""
+import heapq
+import logging
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+from reviews.models import Category, Genre, Title, TitleGenre
+
+WORD = re.compile(r'\w+')
+LAST_CHAR = '\U0010ffff'
+MEMO_SIZE = 1024
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text):
+    return text.casefold().replace('ё', 'е')
+
+
+def word_keys(name):
+    """Хвосты названия от начала каждого слова."""
+    keys = {name}
+    keys.update(name[match.start():] for match in WORD.finditer(name))
+    return keys
+
+
+class PrefixIndex:
+    """Отсортированные ключи одного вида объектов с их популярностью.
+
+    Для узкого префикса перебирается его диапазон ключей. Широкий
+    префикс («а») совпадает с большой долей объектов, для него быстрее
+    идти по рейтингу популярности до первых limit совпадений.
+    """
+
+    def __init__(self, entries=()):
+        self.items = {}
+        self.names = {}
+        self.popularity = {}
+        self.memo = {}
+        keys = []
+        for pk, name, item, popularity in entries:
+            self.items[pk] = item
+            self.names[pk] = normalize(name)
+            self.popularity[pk] = popularity
+            keys.extend((key, pk) for key in word_keys(self.names[pk]))
+        keys.sort()
+        self.keys = keys
+        self.ranking = sorted(self.rank(pk) for pk in self.names)
+
+    def rank(self, pk):
+        return -self.popularity[pk], self.names[pk], pk
+
+    def add(self, pk, name, item):
+        popularity = self.popularity.get(pk, 0)
+        self.remove(pk)
+        self.items[pk] = item
+        self.names[pk] = normalize(name)
+        self.popularity[pk] = popularity
+        for key in word_keys(self.names[pk]):
+            insort(self.keys, (key, pk))
+        insort(self.ranking, self.rank(pk))
+        self.memo.clear()
+
+    def remove(self, pk):
+        name = self.names.get(pk)
+        if name is None:
+            return
+        del self.ranking[bisect_left(self.ranking, self.rank(pk))]
+        for key in word_keys(name):
+            del self.keys[bisect_left(self.keys, (key, pk))]
+        del self.items[pk], self.names[pk], self.popularity[pk]
+        self.memo.clear()
+
+    def bump(self, pk, delta):
+        if pk not in self.names or not delta:
+            return
+        del self.ranking[bisect_left(self.ranking, self.rank(pk))]
+        self.popularity[pk] += delta
+        insort(self.ranking, self.rank(pk))
+        self.memo.clear()
+
+    def matches(self, pk, prefix):
+        name = self.names[pk]
+        return prefix in name and any(
+            key.startswith(prefix) for key in word_keys(name)
+        )
+
+    def search(self, prefix, limit):
+        """Первые limit совпадений по убыванию популярности."""
+        memo_key = (prefix, limit)
+        if memo_key in self.memo:
+            return self.memo[memo_key]
+        start = bisect_left(self.keys, (prefix,))
+        stop = bisect_left(self.keys, (prefix + LAST_CHAR,))
+        if (stop - start) ** 2 >= limit * len(self.names):
+            best = []
+            for _, _, pk in self.ranking:
+                if self.matches(pk, prefix):
+                    best.append(pk)
+                    if len(best) == limit:
+                        break
+        else:
+            pks = {pk for _, pk in self.keys[start:stop]}
+            best = heapq.nsmallest(limit, pks, key=self.rank)
+        result = [self.items[pk] for pk in best]
+        if len(self.memo) >= MEMO_SIZE:
+            self.memo.clear()
+        self.memo[memo_key] = result
+        return result
+
+
+def update(method):
+    """Изменение индекса после коммита.
+
+    До первой сборки изменения пропускаются: сборка прочитает уже
+    записанные данные. Во время фоновой сборки они запоминаются и
+    повторяются на новом индексе, иначе снимок базы, прочитанный до
+    коммита, потерял бы их. Повтор добавлений и удалений безопасен,
+    популярность может ненадолго сдвинуться до следующей сборки.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((method, args, kwargs))
+            if self.indexes is not None:
+                method(self, *args, **kwargs)
+    return wrapper
+
+
+class Autocomplete:
+    """Индексы произведений, жанров и категорий.
+
+    Популярность произведения — число отзывов на него, жанра
+    и категории — сумма отзывов на их произведения. Для пересчета
+    хранятся категория и жанры каждого произведения.
+
+    `start` собирает индексы в фоновом потоке при старте процесса
+    (его вызывают wsgi.py и asgi.py) и пересобирает их раз в
+    `AUTOCOMPLETE_REBUILD_INTERVAL` секунд. Запросы читают базу, только
+    если индекса еще нет: без фонового потока, например в тестах,
+    его соберет первый запрос.
+    """
+    kinds = ('titles', 'genres', 'categories')
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.build_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.indexes = None
+        self.links = {}
+        self.pending = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(
+                target=self.run, name='autocomplete-index', daemon=True
+            )
+        self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                self.build()
+            except Exception:
+                logger.exception('Не удалось собрать индекс подсказок')
+            finally:
+                connection.close()
+            interval = getattr(settings, 'AUTOCOMPLETE_REBUILD_INTERVAL', None)
+            self.wakeup.wait(interval or None)
+            self.wakeup.clear()
+
+    def reset(self):
+        """Сбрасывает индекс; с фоновым потоком старый служит до замены."""
+        if self.thread is not None:
+            self.wakeup.set()
+            return
+        with self.lock:
+            self.indexes = None
+            self.links = {}
+
+    def load(self):
+        """Читает базу и строит новые индексы, не трогая текущие."""
+        entries = []
+        links = {}
+        for pk, name, category, reviews in Title.objects.order_by(
+        ).values_list('pk', 'name', 'category', 'rating_count').iterator():
+            entries.append((pk, name, {'id': pk, 'name': name}, reviews))
+            links[pk] = (category, set())
+        titles = PrefixIndex(entries)
+        for title, genre in TitleGenre.objects.order_by().values_list(
+                'title', 'genre'
+        ).iterator():
+            links[title][1].add(genre)
+        totals = {'genres': Counter(), 'categories': Counter()}
+        for pk, (category, genres) in links.items():
+            reviews = titles.popularity[pk]
+            totals['categories'][category] += reviews
+            for genre in genres:
+                totals['genres'][genre] += reviews
+        indexes = {'titles': titles}
+        for kind, model in (('genres', Genre), ('categories', Category)):
+            indexes[kind] = PrefixIndex(
+                (pk, name, {'name': name, 'slug': slug}, totals[kind][pk])
+                for pk, name, slug in model.objects.values_list(
+                    'pk', 'name', 'slug'
+                )
+            )
+        return indexes, links
+
+    def build(self):
+        """Собирает индексы без блокировки запросов и подменяет их."""
+        with self.build_lock:
+            self.replace()
+
+    def replace(self):
+        with self.lock:
+            self.pending = []
+        try:
+            indexes, links = self.load()
+        except Exception:
+            with self.lock:
+                self.pending = None
+            raise
+        with self.lock:
+            pending, self.pending = self.pending, None
+            self.indexes, self.links = indexes, links
+            for method, args, kwargs in pending:
+                method(self, *args, **kwargs)
+
+    def get_indexes(self):
+        if self.indexes is None:
+            with self.build_lock:
+                if self.indexes is None:
+                    self.replace()
+        return self.indexes
+
+    def search(self, query, kinds, limit):
+        prefix = normalize(query.strip())
+        indexes = self.get_indexes()
+        with self.lock:
+            return {
+                kind: indexes[kind].search(prefix, limit) if prefix else []
+                for kind in kinds
+            }
+
+    @update
+    def title_saved(self, pk, name, category):
+        titles = self.indexes['titles']
+        titles.add(pk, name, {'id': pk, 'name': name})
+        previous, genres = self.links.get(pk, (None, set()))
+        if previous != category:
+            reviews = titles.popularity[pk]
+            self.indexes['categories'].bump(previous, -reviews)
+            self.indexes['categories'].bump(category, reviews)
+        self.links[pk] = (category, genres)
+
+    @update
+    def title_deleted(self, pk):
+        titles = self.indexes['titles']
+        reviews = titles.popularity.get(pk, 0)
+        titles.remove(pk)
+        category, genres = self.links.pop(pk, (None, set()))
+        self.indexes['categories'].bump(category, -reviews)
+        for genre in genres:
+            self.indexes['genres'].bump(genre, -reviews)
+
+    def link(self, title, genre, added):
+        if title not in self.links:
+            return
+        genres = self.links[title][1]
+        if (genre in genres) == added:
+            return
+        if added:
+            genres.add(genre)
+        else:
+            genres.discard(genre)
+        reviews = self.indexes['titles'].popularity.get(title, 0)
+        self.indexes['genres'].bump(genre, reviews if added else -reviews)
+
+    @update
+    def linked(self, title, genre, added):
+        """Учитывает появление или удаление жанра у произведения."""
+        self.link(title, genre, added)
+
+    @update
+    def unlinked_all(self, title=None, genre=None):
+        """Отвязывает все жанры произведения или все произведения жанра."""
+        for pk, (_, genres) in list(self.links.items()):
+            if title is not None and pk != title:
+                continue
+            for linked_genre in list(genres):
+                if genre is None or linked_genre == genre:
+                    self.link(pk, linked_genre, added=False)
+
+    @update
+    def reviewed(self, title, delta):
+        if title not in self.links:
+            return
+        self.indexes['titles'].bump(title, delta)
+        category, genres = self.links[title]
+        self.indexes['categories'].bump(category, delta)
+        for genre in genres:
+            self.indexes['genres'].bump(genre, delta)
+
+    @update
+    def named_saved(self, kind, pk, name, slug):
+        self.indexes[kind].add(pk, name, {'name': name, 'slug': slug})
+
+    @update
+    def named_deleted(self, kind, pk):
+        self.indexes[kind].remove(pk)
+
+
+autocomplete = Autocomplete()
@@ -0,0 +1,160 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'api:version:{}'
+RESPONSE_KEY = 'api:response:{}'
+VERSION_TIMEOUT = 60 * 60 * 24
+# Бэкенды, данные которых видит только свой процесс.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def is_shared_cache():
+    """Версии в кеше API видят все процессы, а не только текущий."""
+    return not isinstance(get_cache(), PROCESS_LOCAL_BACKENDS)
+
+
+def get_version_timeout():
+    return getattr(settings, 'API_CACHE_VERSION_TIMEOUT', VERSION_TIMEOUT)
+
+
+def new_version():
+    # Время вместо единицы: после вытеснения ключа версии старые ответы
+    # не должны снова стать актуальными.
+    return time.time_ns()
+
+
+def get_versions(groups):
+    """Возвращает текущие версии групп, заводя недостающие."""
+    cache = get_cache()
+    keys = [VERSION_KEY.format(group) for group in groups]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), timeout=get_version_timeout())
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*groups):
+    """Сдвигает версии групп, делая их закешированные ответы устаревшими."""
+    cache = get_cache()
+    for group in groups:
+        key = VERSION_KEY.format(group)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, new_version(), timeout=get_version_timeout())
+
+
+def url_digest(request, groups, *extra):
+    """Хеш URL запроса вместе с версиями групп, от которых зависит ответ."""
+    versions = ':'.join(map(str, get_versions(groups)))
+    raw = '|'.join((request.build_absolute_uri(), versions) + extra)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def response_key(request, groups):
+    return RESPONSE_KEY.format(url_digest(request, groups))
+
+
+class CacheGroupsMixin:
+    """Группы версий, от которых зависит ответ вьюсета.
+
+    Список зависит от группы `cache_group`, объект — от группы
+    `<cache_group>-detail` и группы конкретного объекта.
+    Версии групп сдвигаются обработчиками сигналов в `api.signals`.
+    """
+    cache_group = None
+
+    def get_cache_groups(self):
+        if self.action == 'retrieve':
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return [f'{self.cache_group}-detail',
+                    f'{self.cache_group}:{lookup}']
+        return [self.cache_group]
+
+
+class ConditionalResponseMixin(CacheGroupsMixin):
+    """Отдает ETag для list и retrieve и отвечает 304 без запросов к базе.
+
+    ETag строится из URL, формата ответа и версий групп, поэтому
+    для проверки If-None-Match достаточно одного обращения к кешу.
+    Версии в кеше процесса другие воркеры не сдвигают, и 304 на
+    устаревшие данные отвечались бы бессрочно, поэтому ETag отдается,
+    только если кеш API общий.
+    """
+
+    def get_etag(self, request):
+        return '"{}"'.format(url_digest(
+            request, self.get_cache_groups(), request.accepted_renderer.format
+        ))
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if not is_shared_cache():
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag(request)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            if etag in etags or '*' in etags:
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED,
+                    headers={'ETag': etag}
+                )
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(CacheGroupsMixin):
+    """Кеширует ответы list по URL с учетом версий групп."""
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = response_key(request, self.get_cache_groups())
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(
+                key,
+                response.data,
+                getattr(settings, 'API_CACHE_TIMEOUT', 60 * 5)
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedDetailMixin(CachedResponseMixin):
+    """Кеширует ответы list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
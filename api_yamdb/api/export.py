@@ -0,0 +1,78 @@
+"""Выгрузка таблиц целиком в форматах, которые читает csv_loader.
+
+Столбцы совпадают с заголовками файлов `static/data/*.csv`, а файл
+выгрузки называется так же, как файл этой таблицы у csv_loader, поэтому
+выгрузку можно положить в `static/data` и загрузить обратно. Строки читаются
+из базы итератором по первичному ключу и отдаются пачками, так что
+память процесса не растет вместе с таблицей.
+
+Выгрузка работает только под WSGI: ASGIHandler в Django 3.2 перебирает
+тело StreamingHttpResponse прямо в цикле событий, где запросы к базе
+запрещены, и ответ оборвался бы уже после заголовков 200. Под ASGI
+выгрузка отвечает 501.
+"""
+import os
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from reviews.management.commands.csv_loader import DATABASE
+from reviews.models import (Category,
+                            Comment,
+                            CustomUser,
+                            Genre,
+                            Review,
+                            Title,
+                            TitleGenre)
+
+CHUNK_SIZE = 2000
+
+EXPORTS = {
+    'users': (CustomUser, (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    )),
+    'categories': (Category, ('id', 'name', 'slug')),
+    'genres': (Genre, ('id', 'name', 'slug')),
+    'titles': (Title, ('id', 'name', 'year', 'category')),
+    'genre_titles': (TitleGenre, ('id', 'title_id', 'genre_id')),
+    'reviews': (Review, (
+        'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+    )),
+    'comments': (Comment, ('id', 'review_id', 'text', 'author', 'pub_date')),
+}
+
+
+class ExportUnavailable(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = (
+        'Выгрузка доступна только под WSGI: под ASGI Django 3.2 отдает '
+        'потоковый ответ в цикле событий без доступа к базе.'
+    )
+    default_code = 'export_unavailable'
+
+
+def check_streaming(request):
+    """Отказывает в выгрузке под ASGI."""
+    if isinstance(request._request, ASGIRequest):
+        raise ExportUnavailable()
+
+
+def get_chunk_size():
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', None) or CHUNK_SIZE
+
+
+def get_filename(dataset, extension):
+    """Имя файла выгрузки: имя файла таблицы у csv_loader."""
+    name, _ = os.path.splitext(DATABASE[EXPORTS[dataset][0]])
+    return f'{name}.{extension}'
+
+
+def export_rows(dataset, chunk_size):
+    """Столбцы выгрузки и ленивый итератор ее строк."""
+    model, columns = EXPORTS[dataset]
+    rows = model.objects.order_by('pk').values_list(*columns).iterator(
+        chunk_size=chunk_size
+    )
+    return columns, rows
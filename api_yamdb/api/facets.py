@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import TitleGenre
+
+FACETS = ('genre', 'category', 'year')
+ALL_FACETS = ('1', 'true', 'all')
+
+
+class FacetCountsMixin:
+    """Добавляет к списку произведений счетчики по фасетам.
+
+    `?facets=genre,category,year` (или `?facets=all`) возвращает
+    в ответе ключ `facets` с числом произведений текущей выборки
+    по слагу жанра, слагу категории и диапазону лет. Все счетчики
+    считаются одним запросом из сгруппированных подзапросов.
+    """
+    facet_query_param = 'facets'
+    facet_year_bucket = 10
+
+    def get_requested_facets(self, request):
+        value = request.query_params.get(self.facet_query_param)
+        if not value:
+            return ()
+        if value.lower() in ALL_FACETS:
+            return FACETS
+        names = tuple(name.strip() for name in value.split(','))
+        unknown = set(names) - set(FACETS)
+        if unknown:
+            raise ValidationError({self.facet_query_param: (
+                f'Неизвестные фасеты: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(FACETS)}.'
+            )})
+        return names
+
+    def facet_querysets(self, queryset):
+        titles = queryset.order_by().values('pk')
+        bucket = self.facet_year_bucket
+        return {
+            'genre': TitleGenre.objects.filter(title__in=titles).values(
+                value=F('genre__slug')
+            ),
+            'category': queryset.values(value=F('category__slug')),
+            'year': queryset.values(value=Cast(
+                F('year') - F('year') % bucket, CharField()
+            )),
+        }
+
+    def get_facets(self, queryset, names):
+        querysets = self.facet_querysets(queryset)
+        grouped = [
+            querysets[name].order_by().annotate(
+                count=Count('pk'), facet=Value(name, CharField())
+            ).values_list('facet', 'value', 'count')
+            for name in names
+        ]
+        facets = OrderedDict((name, {}) for name in names)
+        for facet, value, count in grouped[0].union(*grouped[1:], all=True):
+            if value is not None:
+                facets[facet][value] = count
+        return facets
+
+    def list(self, request, *args, **kwargs):
+        names = self.get_requested_facets(request)
+        response = super().list(request, *args, **kwargs)
+        if names and isinstance(response.data, dict):
+            response.data['facets'] = self.get_facets(
+                self.filter_queryset(self.get_queryset()), names
+            )
+        return response
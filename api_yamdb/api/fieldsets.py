@@ -0,0 +1,81 @@
+from rest_framework.exceptions import ValidationError
+
+SPARSE_ACTIONS = ('list', 'retrieve')
+
+
+class SparseFieldsetMixin:
+    """Параметры `?fields=` и `?expand=` для list и retrieve.
+
+    `fields` перечисляет поля ответа через запятую, `expand` — связи,
+    которые нужно отдать вложенными объектами вместо слагов. Запрос
+    сужается вместе с ответом: загружаются только нужные столбцы,
+    а связи соединяются и предзагружаются, лишь когда запрошены.
+    Без `fields` ответ и запрос не меняются.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    # Поле ответа -> столбцы модели для only().
+    sparse_columns = {}
+    # Связи, которые можно отдать вложенными объектами.
+    expandable_fields = ()
+    # Поле ответа -> связь для select_related или prefetch_related.
+    sparse_select_related = {}
+    sparse_prefetch_related = {}
+
+    def parse_names(self, param, allowed):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return set()
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = names - set(allowed)
+        if unknown:
+            raise ValidationError({param: (
+                f'Неизвестные поля: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(allowed)}.'
+            )})
+        return names
+
+    def get_sparse_fields(self):
+        """Запрошенные поля и развернутые связи или (None, None)."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None, None
+            if (self.action in SPARSE_ACTIONS
+                    and self.fields_query_param in self.request.query_params):
+                fields = self.parse_names(
+                    self.fields_query_param, self.sparse_columns
+                )
+                expand = self.parse_names(
+                    self.expand_query_param, self.expandable_fields
+                )
+                self._sparse_fields = fields | expand, expand
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields, expand = self.get_sparse_fields()
+        if fields is not None:
+            context.update(fields=fields, expand=expand)
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, _ = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        # Поля курсора нужны для ссылки на следующую страницу.
+        columns = {queryset.model._meta.pk.name}
+        columns.update(
+            name.lstrip('-') for name in getattr(self, 'cursor_ordering', ())
+        )
+        for name in fields:
+            columns.update(self.sparse_columns[name])
+        queryset = queryset.select_related(None).prefetch_related(None)
+        related = [self.sparse_select_related[name]
+                   for name in fields if name in self.sparse_select_related]
+        if related:
+            queryset = queryset.select_related(*related)
+        prefetch = [self.sparse_prefetch_related[name]
+                    for name in fields if name in self.sparse_prefetch_related]
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*columns)
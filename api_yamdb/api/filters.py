@@ -1,14 +1,62 @@
-from django_filters import FilterSet, CharFilter, NumberFilter
+from django_filters import CharFilter, ChoiceFilter, FilterSet, NumberFilter
 
-from reviews.models import Title
+from reviews.models import Title, TitleGenre
+from reviews.search import search_titles
+
+GENRE_MATCH_CHOICES = (('any', 'any'), ('all', 'all'))
 
 
 class TitleFilterSet(FilterSet):
+    """Фильтры произведений.
+
+    Жанры задаются списком (`?genre=drama,comedy` или повтором
+    параметра) и проверяются полусоединением `id IN (...)` по индексу
+    TitleGenre(genre, title), поэтому строки не дублируются
+    и DISTINCT не нужен. `genre_match=all` требует все жанры сразу.
+    """
     name = CharFilter(field_name='name')
     year = NumberFilter(field_name='year')
+    year_min = NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
+    rating_max = NumberFilter(field_name='rating', lookup_expr='lte')
     category = CharFilter(field_name='category__slug')
-    genre = CharFilter(field_name='genre__slug')
+    genre = CharFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=GENRE_MATCH_CHOICES, method='filter_genre_match'
+    )
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = (
+            'name', 'year', 'year_min', 'year_max', 'rating_min',
+            'rating_max', 'category', 'genre', 'genre_match', 'search'
+        )
+
+    def get_genre_slugs(self):
+        slugs = []
+        for value in self.data.getlist('genre'):
+            slugs.extend(slug.strip() for slug in value.split(','))
+        return sorted({slug for slug in slugs if slug})
+
+    def filter_genre(self, queryset, name, value):
+        slugs = self.get_genre_slugs()
+        if not slugs:
+            return queryset
+        links = TitleGenre.objects.values('title')
+        if self.form.cleaned_data.get('genre_match') == 'all':
+            for slug in slugs:
+                queryset = queryset.filter(
+                    pk__in=links.filter(genre__slug=slug)
+                )
+            return queryset
+        return queryset.filter(pk__in=links.filter(genre__slug__in=slugs))
+
+    def filter_genre_match(self, queryset, name, value):
+        """Режим учитывается в filter_genre."""
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск с сортировкой по релевантности."""
+        return search_titles(queryset, value)
@@ -0,0 +1,64 @@
+import threading
+from collections import defaultdict, deque
+
+METRICS = ('queries', 'sql_ms', 'render_ms', 'total_ms')
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(ordered, value):
+    index = min(len(ordered) - 1, len(ordered) * value // 100)
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """Последние замеры запросов по именам маршрутов и HTTP-методам.
+
+    Для каждого маршрута хранится не больше `size` последних значений
+    каждой метрики, перцентили считаются только при чтении отчета.
+    """
+
+    def __init__(self, size=1000):
+        self.size = size
+        self.lock = threading.Lock()
+        self.samples = defaultdict(self.new_route)
+        self.counts = defaultdict(int)
+
+    def new_route(self):
+        return {metric: deque(maxlen=self.size) for metric in METRICS}
+
+    def record(self, route, method, **values):
+        with self.lock:
+            samples = self.samples[route, method]
+            for metric in METRICS:
+                samples[metric].append(values[metric])
+            self.counts[route, method] += 1
+
+    def report(self):
+        with self.lock:
+            snapshot = {
+                route: {metric: sorted(values)
+                        for metric, values in samples.items()}
+                for route, samples in self.samples.items()
+            }
+            counts = dict(self.counts)
+        report = defaultdict(dict)
+        for (route, method), metrics in sorted(snapshot.items()):
+            report[route][method] = {
+                'count': counts[route, method],
+                **{
+                    metric: {
+                        f'p{value}': round(percentile(ordered, value), 3)
+                        for value in PERCENTILES
+                    }
+                    for metric, ordered in metrics.items()
+                }
+            }
+        return dict(report)
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .metrics import registry
+
+# Счетчик текущего запроса. Контекст копируется в sync_to_async, поэтому
+# запросы к базе из потоков async-вью попадают в тот же счетчик.
+current_counter = ContextVar('api_query_counter', default=None)
+
+
+class QueryCounter:
+    """Обертка выполнения SQL, считающая запросы и их время."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def count_queries(execute, sql, params, many, context):
+    """Обертка всех соединений, передающая SQL счетчику запроса."""
+    counter = current_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+class RequestMetricsMiddleware:
+    """Замеряет число SQL-запросов, время SQL, рендеринга и всего запроса.
+
+    Замеры копятся в `api.metrics.registry` по имени маршрута
+    (`api:titles-list`, `api:comments-detail`, ...). При включенной
+    настройке `API_SERVER_TIMING` они же отдаются в заголовке
+    Server-Timing.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Как в MiddlewareMixin: под ASGI с async-цепочкой
+        # middleware сам становится корутиной.
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        counter, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_counter.reset(token)
+        return self.finish(request, response, counter, started)
+
+    async def __acall__(self, request):
+        counter, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_counter.reset(token)
+        return self.finish(request, response, counter, started)
+
+    def start(self, request):
+        counter = QueryCounter()
+        request._render_timing = [0.0, 0.0]
+        return counter, current_counter.set(counter), time.perf_counter()
+
+    def finish(self, request, response, counter, started):
+        total = time.perf_counter() - started
+        render = request._render_timing[1] - request._render_timing[0]
+        match = request.resolver_match
+        if match is not None and match.view_name:
+            registry.record(
+                match.view_name,
+                request.method,
+                queries=counter.count,
+                sql_ms=counter.duration * 1000,
+                render_ms=max(render, 0) * 1000,
+                total_ms=total * 1000
+            )
+        if getattr(settings, 'API_SERVER_TIMING', False):
+            response['Server-Timing'] = (
+                f'db;dur={counter.duration * 1000:.2f};'
+                f'desc="{counter.count} queries", '
+                f'render;dur={max(render, 0) * 1000:.2f}, '
+                f'total;dur={total * 1000:.2f}'
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        timing = request._render_timing
+        timing[0] = time.perf_counter()
+
+        def rendered(response):
+            timing[1] = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
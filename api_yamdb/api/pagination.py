@@ -0,0 +1,152 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(pagination.BasePagination):
+    """Пагинация по ключу сортировки без COUNT(*) и OFFSET.
+
+    Курсор хранит значения полей сортировки последней записи страницы,
+    следующая страница выбирается условием «строго после курсора».
+    Последнее поле сортировки должно быть уникальным (обычно `id`).
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+        rows = list(queryset.order_by(*self.ordering)[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def after(self, position):
+        """Строит условие «запись идет после position» по всем полям."""
+        condition = Q()
+        for index in range(len(self.ordering) - 1, -1, -1):
+            field = self.ordering[index].lstrip('-')
+            lookup = 'lt' if self.ordering[index].startswith('-') else 'gt'
+            step = Q(**{f'{field}__{lookup}': position[index]})
+            if index < len(self.ordering) - 1:
+                step |= Q(**{field: position[index]}) & condition
+            condition = step
+        return condition
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            if (not isinstance(values, list)
+                    or len(values) != len(self.ordering)
+                    or not all(isinstance(value, (str, int, float))
+                               for value in values)):
+                raise ValueError
+            position = [
+                model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+            if None in position:
+                raise ValueError
+            return position
+        except (TypeError, ValueError, UnicodeError, binascii.Error,
+                json.JSONDecodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj):
+        values = []
+        for name in self.ordering:
+            value = getattr(obj, name.lstrip('-'))
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        data = json.dumps(values, ensure_ascii=False).encode('utf-8')
+        return urlsafe_b64encode(data).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(self.page[-1])
+        )
+
+    def get_first_link(self):
+        if self.cursor_query_param not in self.request.query_params:
+            return None
+        return remove_query_param(self.base_url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('first', self.get_first_link()),
+            ('results', data),
+        ]))
+
+
+class PageNumberOrKeysetPagination(pagination.PageNumberPagination):
+    """Постраничная пагинация с включаемым режимом курсора.
+
+    Режим курсора выбирается параметром `?pagination=cursor`, наличием
+    `cursor` в запросе или настройкой `CURSOR_PAGINATION_DEFAULT`.
+    Порядок ключей берется из атрибута `cursor_ordering` вьюсета.
+
+    Поиск сортирует выдачу по релевантности, которую курсор не может
+    продолжить: с `search` по умолчанию используются номера страниц,
+    а явный запрос курсора отклоняется с 400.
+    """
+    mode_query_param = 'pagination'
+    ranked_query_params = ('search',)
+    keyset = None
+
+    def use_keyset(self, request, view):
+        if getattr(view, 'cursor_ordering', None) is None:
+            return False
+        params = request.query_params
+        mode = params.get(self.mode_query_param)
+        requested = (mode == 'cursor' if mode is not None
+                     else KeysetPagination.cursor_query_param in params)
+        ranked = any(params.get(name) for name in self.ranked_query_params)
+        if ranked:
+            if requested:
+                raise ValidationError({
+                    self.mode_query_param: 'Курсор нельзя совмещать с '
+                                           'поиском, используйте страницы.'
+                })
+            return False
+        if mode is not None:
+            return requested
+        return requested or getattr(
+            settings, 'CURSOR_PAGINATION_DEFAULT', False
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request, view):
+            self.keyset = KeysetPagination(view.cursor_ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
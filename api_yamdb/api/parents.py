@@ -0,0 +1,46 @@
+from rest_framework.generics import get_object_or_404
+
+
+class NestedParentMixin:
+    """Родитель вложенного маршрута, найденный один раз за запрос.
+
+    `parent_lookups` сопоставляет поля родителя с аргументами URL.
+    Выборка вьюсета фильтруется по всей цепочке (`title_id`,
+    `review_id`) соединением в том же запросе, отдельный запрос
+    к родителю нужен только при создании объекта и для пустой
+    страницы списка, где он отличает 404 от пустого списка.
+    Найденный родитель запоминается на вьюсете и общий для
+    сериализаторов (через `view` в контексте) и perform_create.
+    """
+    # Внешний ключ модели вьюсета на родителя.
+    parent_field = None
+    # Поле родителя -> аргумент URL.
+    parent_lookups = {}
+
+    def get_parent_filter(self, prefix=''):
+        return {
+            f'{prefix}{field}': self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookups.items()
+        }
+
+    def get_parent_queryset(self):
+        field = self.queryset.model._meta.get_field(self.parent_field)
+        return field.related_model.objects.all()
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.get_parent_queryset(), **self.get_parent_filter()
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            **self.get_parent_filter(f'{self.parent_field}__')
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_parent()
+        return page
@@ -28,4 +28,4 @@ class IsAdminModeratorOwnerOrReadOnly(permissions.BasePermission):
                 and (request.user.is_staff
                      or request.user.role == 'admin'
                      or request.user.role == 'moderator'
-                     or obj.author == request.user))
+                     or obj.author_id == request.user.id))
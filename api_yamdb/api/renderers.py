@@ -0,0 +1,114 @@
+import csv
+import io
+from itertools import islice
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON-рендерер на orjson с откатом на стандартный JSONRenderer.
+
+    Даты, Decimal и прочие нестандартные типы передаются в кодировщик DRF,
+    поэтому вывод совпадает с JSONRenderer. Отступы, ASCII-вывод и
+    значения, которые orjson не умеет кодировать, отдаются родителю.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace(
+            '\u2029'.encode(), b'\\u2029'
+        )
+
+
+class RowStreamMixin:
+    """Потоковый вывод строк таблицы пачками по chunk_size строк.
+
+    `render` отдает обычные ответы вьюхи (например, ошибки), `stream` —
+    генератор байтов для StreamingHttpResponse.
+    """
+
+    def render_header(self, columns):
+        return b''
+
+    def render_rows(self, columns, rows):
+        raise NotImplementedError
+
+    def stream(self, columns, rows, chunk_size):
+        header = self.render_header(columns)
+        if header:
+            yield header
+        rows = iter(rows)
+        for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+            yield self.render_rows(columns, chunk)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        columns = list(items[0]) if items else []
+        return self.render_header(columns) + self.render_rows(
+            columns, [[item.get(column) for column in columns]
+                      for item in items]
+        )
+
+
+class NDJSONRenderer(RowStreamMixin, FastJSONRenderer):
+    """Построчный JSON: каждая запись — объект на отдельной строке."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render_rows(self, columns, rows):
+        return b''.join(
+            FastJSONRenderer.render(self, dict(zip(columns, row))) + b'\n'
+            for row in rows
+        )
+
+
+class CSVRenderer(RowStreamMixin, BaseRenderer):
+    """CSV с заголовком; даты в том же виде, что и в JSON-ответах."""
+    media_type = 'text/csv'
+    format = 'csv'
+    encoder = JSONEncoder()
+
+    def encode(self, value):
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return self.encoder.default(value)
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([self.encode(value) for value in row])
+        return buffer.getvalue().encode(self.charset)
+
+    def render_header(self, columns):
+        return self.write([columns]) if columns else b''
+
+    def render_rows(self, columns, rows):
+        return self.write(rows)
@@ -1,9 +1,12 @@
 import datetime as dt
 import re
+from operator import attrgetter
 
+from django.db import connections, router, transaction
 from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils.functional import cached_property
 from rest_framework import serializers, validators
-from rest_framework.generics import get_object_or_404
 from rest_framework.exceptions import ValidationError
 
 from reviews.models import (CustomUser,
@@ -11,10 +14,23 @@ from reviews.models import (CustomUser,
                             Comment,
                             Genre,
                             Review,
-                            Title)
+                            Title,
+                            TitleGenre)
 
 
-class CategorySerializer(serializers.ModelSerializer):
+RESERVED_SLUGS = ('bulk',)
+
+
+class SlugSerializerMixin:
+    """Запрещает слаги, совпадающие с маршрутами вьюсета без слага."""
+
+    def validate_slug(self, value):
+        if value in RESERVED_SLUGS:
+            raise serializers.ValidationError(f"Слаг '{value}' запрещен")
+        return value
+
+
+class CategorySerializer(SlugSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
     class Meta:
@@ -22,7 +38,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SlugSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для жанров."""
 
     class Meta:
@@ -43,6 +59,83 @@ class TitleSerializer(serializers.ModelSerializer):
         )
 
 
+PUB_DATE_FIELD = serializers.DateTimeField()
+
+
+def send_created(objects):
+    """Рассылает post_save для объектов из bulk_create.
+
+    bulk_create не отправляет сигналов, а на них держатся сброс кеша
+    и индекс подсказок.
+    """
+    for obj in objects:
+        post_save.send(
+            sender=type(obj), instance=obj, created=True, update_fields=None,
+            raw=False, using=obj._state.db
+        )
+
+
+class SparseReadSerializer(serializers.BaseSerializer):
+    """Основа быстрых сериализаторов чтения.
+
+    Значение каждого поля отдает вызываемый атрибут `get_<поле>`.
+    В контексте можно передать `fields` — набор полей ответа —
+    и `expand` — связи, которые отдаются вложенными объектами, а не
+    слагами. Без `fields` ответ полный и связи развернуты.
+    """
+    field_names = ()
+
+    @cached_property
+    def getters(self):
+        fields = self.context.get('fields')
+        return [
+            (name, getattr(self, f'get_{name}'))
+            for name in self.field_names
+            if fields is None or name in fields
+        ]
+
+    @cached_property
+    def expanded(self):
+        """Связи, которые отдаются вложенными объектами."""
+        if self.context.get('fields') is None:
+            return frozenset(self.field_names)
+        return frozenset(self.context.get('expand', ()))
+
+    def to_representation(self, instance):
+        return {name: getter(instance) for name, getter in self.getters}
+
+
+class TitleReadSerializer(SparseReadSerializer):
+    """Быстрый сериализатор чтения произведений.
+
+    Отдает то же, что TitleSerializer, но без построения полей
+    и вложенных сериализаторов для каждой строки.
+    """
+    field_names = (
+        'id', 'name', 'year', 'rating', 'description', 'category', 'genre'
+    )
+
+    get_id = attrgetter('id')
+    get_name = attrgetter('name')
+    get_year = attrgetter('year')
+    get_rating = attrgetter('rating')
+    get_description = attrgetter('description')
+
+    def get_category(self, instance):
+        category = instance.category
+        if category is None or 'category' not in self.expanded:
+            return category and category.slug
+        return {'name': category.name, 'slug': category.slug}
+
+    def get_genre(self, instance):
+        if 'genre' not in self.expanded:
+            return [genre.slug for genre in instance.genre.all()]
+        return [
+            {'name': genre.name, 'slug': genre.slug}
+            for genre in instance.genre.all()
+        ]
+
+
 class TitleCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания произведений."""
     category = serializers.SlugRelatedField(
@@ -77,6 +170,176 @@ class TitleCreateSerializer(serializers.ModelSerializer):
     ]
 
 
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """Создание пачки объектов.
+
+    Элементы сначала проверяются по отдельности без запросов к базе,
+    затем `validate_bulk` дочернего сериализатора проверяет всю пачку
+    несколькими запросами и возвращает ошибки по позициям.
+    """
+
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+        errors = self.child.validate_bulk(items)
+        if any(errors):
+            raise ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        return self.child.bulk_create(validated_data)
+
+
+def duplicates(values):
+    """Значения, которые встречаются в списке больше одного раза."""
+    seen, repeated = set(), set()
+    for value in values:
+        (repeated if value in seen else seen).add(value)
+    return repeated
+
+
+class NamedBulkSerializer(SlugSerializerMixin, serializers.ModelSerializer):
+    """Пачка категорий или жанров: уникальность name и slug одним запросом."""
+
+    class Meta:
+        fields = ('name', 'slug')
+        extra_kwargs = {
+            'name': {'validators': []},
+            'slug': {'validators': []},
+        }
+        list_serializer_class = BulkCreateListSerializer
+
+    def validate_bulk(self, items):
+        model = self.Meta.model
+        taken = {'name': set(), 'slug': set()}
+        for name, slug in model.objects.filter(
+            Q(name__in=[item['name'] for item in items])
+            | Q(slug__in=[item['slug'] for item in items])
+        ).order_by().values_list('name', 'slug'):
+            taken['name'].add(name)
+            taken['slug'].add(slug)
+        for field in taken:
+            taken[field] |= duplicates(item[field] for item in items)
+        return [
+            {
+                field: [f'Значение {item[field]} уже занято.']
+                for field in taken if item[field] in taken[field]
+            }
+            for item in items
+        ]
+
+    def bulk_create(self, items):
+        objects = [self.Meta.model(**item) for item in items]
+        with transaction.atomic():
+            self.Meta.model.objects.bulk_create(objects)
+            send_created(objects)
+        return objects
+
+
+class CategoryBulkSerializer(NamedBulkSerializer):
+    """Сериализатор для массового создания категорий."""
+
+    class Meta(NamedBulkSerializer.Meta):
+        model = Category
+
+
+class GenreBulkSerializer(NamedBulkSerializer):
+    """Сериализатор для массового создания жанров."""
+
+    class Meta(NamedBulkSerializer.Meta):
+        model = Genre
+
+
+class TitleBulkSerializer(TitleCreateSerializer):
+    """Сериализатор для массового создания произведений.
+
+    Слаги категорий и жанров проверяются двумя запросами на всю пачку,
+    уникальность (name, year, category) — еще одним.
+    """
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+    validators = []
+
+    class Meta(TitleCreateSerializer.Meta):
+        list_serializer_class = BulkCreateListSerializer
+
+    def validate_bulk(self, items):
+        categories = Category.objects.in_bulk(
+            {item['category'] for item in items}, field_name='slug'
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for item in items for slug in item['genre']},
+            field_name='slug'
+        )
+        keys = [
+            (item['name'], item['year'], item['category']) for item in items
+        ]
+        taken = duplicates(keys) | set(Title.objects.filter(
+            name__in={key[0] for key in keys},
+            year__in={key[1] for key in keys}
+        ).order_by().values_list('name', 'year', 'category__slug'))
+        errors = []
+        for item, key in zip(items, keys):
+            error = {}
+            if item['category'] not in categories:
+                error['category'] = [f'Категории {item["category"]} нет.']
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                error['genre'] = [f'Жанров {", ".join(missing)} нет.']
+            if key in taken:
+                error['non_field_errors'] = [
+                    'Произведение с такими name, year и category уже есть.'
+                ]
+            errors.append(error)
+            item['category'] = categories.get(item['category'])
+            item['genre'] = [genres[slug] for slug in item['genre']
+                             if slug in genres]
+        return errors
+
+    def insert_titles(self, titles):
+        """Вставляет произведения и проставляет им первичные ключи."""
+        connection = connections[router.db_for_write(Title)]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Title.objects.bulk_create(titles)
+        elif connection.vendor == 'sqlite' and titles:
+            # SQLite в Django 3.2 не возвращает первичные ключи
+            # из bulk_create. После первой вставки транзакция держит
+            # блокировку записи до коммита, а AUTOINCREMENT выдает ключи
+            # по возрастанию, так что пачка заняла ключи подряд
+            # до последнего.
+            Title.objects.bulk_create(titles)
+            last = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            ).first()
+            for pk, title in zip(
+                range(last - len(titles) + 1, last + 1), titles
+            ):
+                title.pk = pk
+        else:
+            # На MySQL и Oracle ключи пачки могут чередоваться с чужими
+            # вставками или идти с шагом: вставка по одному.
+            for title in titles:
+                title.save(force_insert=True)
+            return
+        send_created(titles)
+
+    def bulk_create(self, items):
+        titles = [
+            Title(**{key: value for key, value in item.items()
+                     if key != 'genre'})
+            for item in items
+        ]
+        with transaction.atomic():
+            self.insert_titles(titles)
+            links = [
+                TitleGenre(title=title, genre=genre)
+                for title, item in zip(titles, items)
+                for genre in dict.fromkeys(item['genre'])
+            ]
+            TitleGenre.objects.bulk_create(links)
+            send_created(links)
+        return titles
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     """Сериализатор для отзывов к произведениям."""
     author = serializers.SlugRelatedField(
@@ -90,17 +353,26 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'score', 'author', 'pub_date')
 
     def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title = get_object_or_404(
-            Title, pk=self.context['view'].kwargs.get('title_id')
-        )
-        if request.method == 'POST':
-            if Review.objects.filter(title=title, author=author):
+        if self.context['request'].method == 'POST':
+            # Произведение найдено вьюсетом вместе с флагом reviewed.
+            if self.context['view'].get_parent().reviewed:
                 raise ValidationError('Можно оставить только один отзыв')
         return data
 
 
+class ReviewReadSerializer(SparseReadSerializer):
+    """Быстрый сериализатор чтения отзывов, повторяет ReviewSerializer."""
+    field_names = ('id', 'text', 'score', 'author', 'pub_date')
+
+    get_id = attrgetter('id')
+    get_text = attrgetter('text')
+    get_score = attrgetter('score')
+    get_author = attrgetter('author.username')
+
+    def get_pub_date(self, instance):
+        return PUB_DATE_FIELD.to_representation(instance.pub_date)
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Сериализатор для комментариев к отзывам."""
     author = serializers.SlugRelatedField(
@@ -112,6 +384,20 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
+class CommentReadSerializer(ReviewReadSerializer):
+    """Быстрый сериализатор чтения комментариев."""
+    field_names = ('id', 'text', 'author', 'pub_date')
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """Параметры запроса подсказок."""
+    q = serializers.CharField(max_length=256, allow_blank=True)
+    type = serializers.MultipleChoiceField(
+        choices=('titles', 'genres', 'categories'), required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
 class UserRegistrationSerializer(serializers.Serializer):
     """Сериализатор для создания пользователя."""
     username = serializers.CharField(max_length=150, required=True)
@@ -141,7 +427,7 @@ class UserRegistrationSerializer(serializers.Serializer):
 class TokenSerializer(serializers.ModelSerializer):
     """Сериализатор для получения токена."""
     username = serializers.SlugField(max_length=150, required=True)
-    confirmation_code = serializers.IntegerField(required=True)
+    confirmation_code = serializers.CharField(max_length=254, required=True)
 
     class Meta:
         model = CustomUser
@@ -0,0 +1,201 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, CustomUser, Genre, Review,
+                            Title, TitleGenre)
+from reviews.signals import access_changed, catalogue_changed
+
+from .authentication import forget_on_commit, revoke_tokens
+from .autocomplete import autocomplete
+from .cache import get_cache, invalidate, is_shared_cache
+from .middleware import count_queries
+
+
+def invalidate_on_commit(*groups):
+    transaction.on_commit(partial(invalidate, *groups))
+
+
+def on_commit(func, *args, **kwargs):
+    transaction.on_commit(partial(func, *args, **kwargs))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    """Категории вложены в произведения, поэтому сбрасываются и они."""
+    invalidate_on_commit('categories', 'titles', 'titles-detail')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    """Жанры вложены в произведения, поэтому сбрасываются и они."""
+    invalidate_on_commit('genres', 'titles', 'titles-detail')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    invalidate_on_commit(
+        'titles', f'titles:{instance.pk}', f'reviews:{instance.pk}'
+    )
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_changed(sender, instance, **kwargs):
+    invalidate_on_commit('titles', f'titles:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=TitleGenre)
+def title_genres_set(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        invalidate_on_commit('titles', 'titles-detail')
+    else:
+        invalidate_on_commit('titles', f'titles:{instance.pk}')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """Отзыв меняет рейтинг произведения в списке и в карточке."""
+    invalidate_on_commit(
+        'titles',
+        f'titles:{instance.title_id}',
+        f'reviews:{instance.title_id}'
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate_on_commit(f'comments:{instance.review_id}')
+
+
+@receiver(catalogue_changed)
+def catalogue_reloaded(sender, **kwargs):
+    """Возвращает предупреждение, если сброс не дойдет до сервера."""
+    invalidate_on_commit(
+        'categories', 'genres', 'titles', 'titles-detail',
+        'reviews', 'comments'
+    )
+    if not is_shared_cache():
+        return (
+            f'Кеш API ({type(get_cache()).__name__}) хранится в памяти '
+            'процесса: сброс из команды не дойдет до работающего сервера, '
+            'его ответы обновятся через API_CACHE_TIMEOUT. Для сброса '
+            'из команд укажите в API_CACHE_ALIAS общий кеш.'
+        )
+
+
+# Индекс подсказок. Значения снимаются в момент сигнала: после удаления
+# у объекта уже не будет первичного ключа.
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def named_saved_for_autocomplete(sender, instance, **kwargs):
+    kind = 'categories' if sender is Category else 'genres'
+    on_commit(
+        autocomplete.named_saved,
+        kind, instance.pk, instance.name, instance.slug
+    )
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def named_deleted_for_autocomplete(sender, instance, **kwargs):
+    kind = 'categories' if sender is Category else 'genres'
+    on_commit(autocomplete.named_deleted, kind, instance.pk)
+
+
+@receiver(post_save, sender=Title)
+def title_saved_for_autocomplete(sender, instance, **kwargs):
+    on_commit(
+        autocomplete.title_saved,
+        instance.pk, instance.name, instance.category_id
+    )
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted_for_autocomplete(sender, instance, **kwargs):
+    on_commit(autocomplete.title_deleted, instance.pk)
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_for_autocomplete(sender, instance, **kwargs):
+    on_commit(
+        autocomplete.linked, instance.title_id, instance.genre_id,
+        added='created' in kwargs
+    )
+
+
+@receiver(m2m_changed, sender=TitleGenre)
+def title_genres_for_autocomplete(sender, instance, action, reverse,
+                                  pk_set, **kwargs):
+    if action == 'post_clear':
+        key = 'genre' if reverse else 'title'
+        on_commit(autocomplete.unlinked_all, **{key: instance.pk})
+    elif action in ('post_add', 'post_remove'):
+        for pk in pk_set:
+            title, genre = (pk, instance.pk) if reverse else (instance.pk, pk)
+            on_commit(
+                autocomplete.linked, title, genre,
+                added=action == 'post_add'
+            )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_for_autocomplete(sender, instance, **kwargs):
+    created = kwargs.get('created')
+    if created is False:
+        return
+    on_commit(autocomplete.reviewed, instance.title_id, 1 if created else -1)
+
+
+@receiver(catalogue_changed)
+def catalogue_for_autocomplete(sender, **kwargs):
+    on_commit(autocomplete.reset)
+
+
+# Токены доступа несут username, роль и права пользователя в claims.
+
+@receiver(post_save, sender=CustomUser)
+def user_saved(sender, instance, created, **kwargs):
+    """Отзывает токены, claims которых больше не совпадают с базой."""
+    access = instance.access_values()
+    loaded = getattr(instance, '_loaded_access', None)
+    if not created and access != loaded:
+        revoke_tokens(instance.pk)
+        # Версия увеличена запросом в базе и перечитается при обращении.
+        instance.__dict__.pop('token_version', None)
+        if loaded is None or loaded[0] != instance.username:
+            # Имя автора входит в ответы отзывов и комментариев.
+            invalidate_on_commit('reviews', 'comments')
+    instance._loaded_access = access
+
+
+@receiver(post_delete, sender=CustomUser)
+def user_deleted(sender, instance, **kwargs):
+    """Без строки в базе версии нет, и токены отклоняются."""
+    forget_on_commit(instance.pk)
+
+
+@receiver(access_changed)
+def users_access_changed(sender, user_ids, **kwargs):
+    """Массовое изменение полей доступа в обход сигналов моделей."""
+    revoke_tokens(*user_ids)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    """SQL нового соединения считается в RequestMetricsMiddleware."""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
@@ -0,0 +1,159 @@
+"""Ограничение частоты запросов по алгоритму token bucket.
+
+У каждого ключа (IP или пользователя) есть ведро на `N` жетонов,
+которое пополняется со скоростью `N` жетонов за период: запрос берет
+один жетон, пустое ведро отвечает 429 с Retry-After. Частоты задаются
+в `API_THROTTLE_RATES` строками DRF вида `'20/min'`; области без частоты
+не ограничиваются.
+
+Ведра хранятся в памяти процесса (`API_THROTTLE_STORAGE = 'local'`)
+в нескольких шардах со своими блокировками, проверка стоит O(1) и
+не обращается к базе. С `'cache'` ведра лежат в кеше API
+(`api.cache.get_cache`) и общие для всех процессов, если кеш общий;
+чтение и запись ведра там не атомарны, поэтому при одновременных
+запросах лимит соблюдается приблизительно.
+
+IP берется из REMOTE_ADDR: X-Forwarded-For учитывается, только если
+в `NUM_PROXIES` настроек REST_FRAMEWORK указано число доверенных прокси.
+"""
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from .cache import get_cache
+
+BUCKET_KEY = 'api:throttle:{}'
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """'20/min' -> (20, 60): размер ведра и период в секундах."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def refill(bucket, capacity, per_second, now):
+    """Жетоны ведра на момент now; новое ведро полное."""
+    if bucket is None:
+        return capacity
+    tokens, updated = bucket
+    return min(capacity, tokens + (now - updated) * per_second)
+
+
+class LocalBuckets:
+    """Ведра в памяти процесса, разложенные по шардам.
+
+    Ключ попадает в шард по crc32, так что потоки с разными ключами
+    почти не ждут друг друга. В шарде хранится не больше `max_keys`
+    ведер: при переполнении выбрасывается давно не использованное,
+    забытое ведро просто снова станет полным.
+    """
+
+    def __init__(self, shards=16, max_keys=10000):
+        self.max_keys = max_keys
+        self.shards = [(threading.Lock(), OrderedDict())
+                       for _ in range(shards)]
+
+    def take(self, key, capacity, per_second):
+        """Берет жетон; возвращает (разрешено, сколько ждать в секундах)."""
+        lock, buckets = self.shards[
+            zlib.crc32(key.encode('utf-8')) % len(self.shards)
+        ]
+        now = time.monotonic()
+        with lock:
+            tokens = refill(buckets.pop(key, None), capacity, per_second, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            buckets[key] = (tokens, now)
+            if len(buckets) > self.max_keys:
+                buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / per_second
+
+    def reset(self):
+        for lock, buckets in self.shards:
+            with lock:
+                buckets.clear()
+
+
+class CacheBuckets:
+    """Ведра в кеше API, общие для процессов с общим кешем."""
+
+    def take(self, key, capacity, per_second):
+        cache = get_cache()
+        key = BUCKET_KEY.format(key)
+        now = time.time()
+        tokens = refill(cache.get(key), capacity, per_second, now)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Через capacity / per_second секунд ведро снова полное.
+        cache.set(key, (tokens, now), timeout=capacity / per_second)
+        return allowed, 0 if allowed else (1 - tokens) / per_second
+
+
+local_buckets = LocalBuckets()
+STORAGES = {'local': lambda: local_buckets, 'cache': CacheBuckets}
+
+
+def get_storage():
+    return STORAGES[getattr(settings, 'API_THROTTLE_STORAGE', 'local')]()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Пропускает запрос, только если жетон нашелся во всех его ведрах."""
+    scope = None
+
+    def get_keys(self, request, view):
+        return [f'ip:{self.get_ident(request)}']
+
+    def allow_request(self, request, view):
+        rate = getattr(settings, 'API_THROTTLE_RATES', {}).get(self.scope)
+        if rate is None:
+            return True
+        capacity, period = parse_rate(rate)
+        storage = get_storage()
+        for key in self.get_keys(request, view):
+            allowed, self.delay = storage.take(
+                f'{self.scope}:{key}', capacity, capacity / period
+            )
+            if not allowed:
+                return False
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class AuthThrottle(TokenBucketThrottle):
+    """Регистрация и получение токена: ведра IP и имени пользователя."""
+    scope = 'auth'
+
+    def get_keys(self, request, view):
+        keys = super().get_keys(request, view)
+        data = request.data
+        username = data.get('username') if isinstance(data, dict) else None
+        if isinstance(username, str) and username:
+            keys.append(f'user:{username[:150].lower()}')
+        return keys
+
+
+class WriteThrottle(TokenBucketThrottle):
+    """Изменяющие запросы: ведра IP и пользователя, чтение без лимита."""
+    scope = 'write'
+
+    def get_keys(self, request, view):
+        keys = super().get_keys(request, view)
+        if request.user.is_authenticated:
+            keys.append(f'user:{request.user.pk}')
+        return keys
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        return super().allow_request(request, view)
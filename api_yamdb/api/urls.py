@@ -2,9 +2,12 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (AdminUserDetailViewSet,
+                    AutocompleteView,
                     CategoryViewSet,
                     CommentViewSet,
+                    ExportView,
                     GenreViewSet,
+                    RequestMetricsView,
                     ReviewViewSet,
                     TitleViewSet,
                     UserRegistration,
@@ -14,9 +17,9 @@ app_name = 'api'
 
 router_api_v1 = DefaultRouter()
 
-router_api_v1.register('categories', CategoryViewSet)
-router_api_v1.register('genres', GenreViewSet)
-router_api_v1.register('titles', TitleViewSet)
+router_api_v1.register('categories', CategoryViewSet, basename='categories')
+router_api_v1.register('genres', GenreViewSet, basename='genres')
+router_api_v1.register('titles', TitleViewSet, basename='titles')
 router_api_v1.register('users', AdminUserDetailViewSet, basename='users')
 router_api_v1.register(
     r'titles/(?P<title_id>\d+)/reviews',
@@ -30,7 +33,14 @@ router_api_v1.register(
 )
 
 urlpatterns = [
-    path('v1/auth/signup/', UserRegistration.as_view()),
-    path('v1/auth/token/', get_token),
+    path('v1/auth/signup/', UserRegistration.as_view(), name='signup'),
+    path('v1/auth/token/', get_token, name='token'),
+    path(
+        'v1/autocomplete/', AutocompleteView.as_view(), name='autocomplete'
+    ),
+    path('v1/metrics/', RequestMetricsView.as_view(), name='metrics'),
+    path(
+        'v1/export/<slug:dataset>/', ExportView.as_view(), name='export'
+    ),
     path('v1/', include(router_api_v1.urls)),
 ]
@@ -1,29 +1,40 @@
 from django.conf import settings
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Exists, OuterRef, prefetch_related_objects
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import filters, pagination, status, viewsets, mixins
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import (api_view, permission_classes,
+                                       throttle_classes, action)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
 
 from reviews.models import (CustomUser,
                             Category,
+                            Comment,
                             Genre,
                             Review,
                             Title)
+from reviews.outbox import enqueue_mail
 
 from .serializers import (AdminUserDetailSerializer,
+                          AutocompleteQuerySerializer,
+                          CategoryBulkSerializer,
                           CategorySerializer,
+                          CommentReadSerializer,
                           CommentSerializer,
                           UserRegistrationSerializer,
+                          GenreBulkSerializer,
                           GenreSerializer,
+                          ReviewReadSerializer,
                           ReviewSerializer,
+                          TitleBulkSerializer,
+                          TitleReadSerializer,
                           TitleSerializer,
                           TitleCreateSerializer,
                           TokenSerializer,
@@ -33,7 +44,62 @@ from .permissions import (IsAdminOnly,
                           IsAdminOrReadOnly,
                           IsAdminModeratorOwnerOrReadOnly)
 
+from .asyncviews import READ_ACTIONS, AsyncReadMixin
+from .authentication import access_token_for
+from .autocomplete import autocomplete
+from .cache import (CachedDetailMixin,
+                    CachedResponseMixin,
+                    ConditionalResponseMixin)
+from .export import (EXPORTS,
+                     check_streaming,
+                     export_rows,
+                     get_chunk_size,
+                     get_filename)
+from .facets import FacetCountsMixin
+from .fieldsets import SparseFieldsetMixin
 from .filters import TitleFilterSet
+from .metrics import registry as metrics_registry
+from .pagination import PageNumberOrKeysetPagination
+from .parents import NestedParentMixin
+from .renderers import CSVRenderer, NDJSONRenderer
+from .throttling import AuthThrottle, WriteThrottle
+
+BULK_MAX_ITEMS = 1000
+
+
+class BulkCreateMixin:
+    """Действие `bulk`: создание списка объектов одним запросом к API.
+
+    Пачка создается целиком в одной транзакции или не создается вовсе.
+    При ошибках ответ 400 содержит список ошибок по позициям
+    (пустой объект у верных элементов), при успехе — созданные объекты.
+    """
+    bulk_serializer_class = None
+
+    def get_bulk_representation(self, objects, serializer):
+        return serializer.data
+
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError('Ожидается список объектов.')
+        if len(request.data) > BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'Не больше {BULK_MAX_ITEMS} объектов за запрос.'
+            )
+        serializer = self.bulk_serializer_class(
+            data=request.data, many=True,
+            context=self.get_serializer_context()
+        )
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+        objects = serializer.save()
+        return Response(
+            self.get_bulk_representation(objects, serializer),
+            status=status.HTTP_201_CREATED
+        )
 
 
 class CreateDeleteListViewSet(mixins.CreateModelMixin,
@@ -48,97 +114,236 @@ class CreateDeleteListViewSet(mixins.CreateModelMixin,
     lookup_field = 'slug'
 
 
-class CategoryViewSet(CreateDeleteListViewSet):
+class CategoryViewSet(CachedResponseMixin,
+                      BulkCreateMixin,
+                      CreateDeleteListViewSet):
     """Вьюсет для категорий."""
+    cache_group = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_serializer_class = CategoryBulkSerializer
 
 
-class GenreViewSet(CreateDeleteListViewSet):
+class GenreViewSet(CachedResponseMixin,
+                   BulkCreateMixin,
+                   CreateDeleteListViewSet):
     """Вьюсет для жанров."""
+    cache_group = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_serializer_class = GenreBulkSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(AsyncReadMixin,
+                   ConditionalResponseMixin,
+                   CachedDetailMixin,
+                   FacetCountsMixin,
+                   SparseFieldsetMixin,
+                   BulkCreateMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет для произведений."""
+    cache_group = 'titles'
+    bulk_serializer_class = TitleBulkSerializer
+    sparse_columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'category': ('category__name', 'category__slug'),
+        'genre': (),
+    }
+    expandable_fields = ('category', 'genre')
+    sparse_select_related = {'category': 'category'}
+    sparse_prefetch_related = {'genre': 'genre'}
     queryset = Title.objects.select_related(
         'category'
     ).prefetch_related(
         'genre'
-    ).annotate(
-        rating=Avg('reviews__score')
     ).order_by('name')
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = PageNumberOrKeysetPagination
+    cursor_ordering = ('name', 'id')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilterSet
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update']:
             return TitleCreateSerializer
+        if self.action in READ_ACTIONS:
+            return TitleReadSerializer
         return TitleSerializer
 
+    def get_bulk_representation(self, objects, serializer):
+        prefetch_related_objects(objects, 'genre')
+        return TitleReadSerializer(objects, many=True).data
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(AsyncReadMixin,
+                    ConditionalResponseMixin,
+                    SparseFieldsetMixin,
+                    NestedParentMixin,
+                    viewsets.ModelViewSet):
     """Вьюсет для отзывов к произведениям."""
+    queryset = Review.objects.select_related('author')
+    parent_field = 'title'
+    parent_lookups = {'pk': 'title_id'}
+    sparse_columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'score': ('score',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+    sparse_select_related = {'author': 'author'}
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
+    throttle_classes = (WriteThrottle,)
+    pagination_class = PageNumberOrKeysetPagination
+    cursor_ordering = ('pub_date', 'id')
+
+    def get_serializer_class(self):
+        if self.action in READ_ACTIONS:
+            return ReviewReadSerializer
+        return ReviewSerializer
 
-    def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.select_related('author').all()
+    def get_cache_groups(self):
+        return ['reviews', f'reviews:{self.kwargs.get("title_id")}']
+
+    def get_parent_queryset(self):
+        queryset = super().get_parent_queryset()
+        if self.action == 'create':
+            # Проверка единственности отзыва тем же запросом.
+            return queryset.annotate(reviewed=Exists(Review.objects.filter(
+                title=OuterRef('pk'), author=self.request.user.pk
+            )))
+        return queryset
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.get_parent())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(AsyncReadMixin,
+                     ConditionalResponseMixin,
+                     SparseFieldsetMixin,
+                     NestedParentMixin,
+                     viewsets.ModelViewSet):
     """Вьюсет для комментариев к отзывам."""
+    queryset = Comment.objects.select_related('author')
+    parent_field = 'review'
+    parent_lookups = {'pk': 'review_id', 'title': 'title_id'}
+    sparse_columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+    sparse_select_related = {'author': 'author'}
     serializer_class = CommentSerializer
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
+    throttle_classes = (WriteThrottle,)
+    pagination_class = PageNumberOrKeysetPagination
+    cursor_ordering = ('pub_date', 'id')
+
+    def get_serializer_class(self):
+        if self.action in READ_ACTIONS:
+            return CommentReadSerializer
+        return CommentSerializer
 
-    def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        review = title.reviews.get(pk=self.kwargs.get('review_id'))
-        return review.comments.select_related('author').all()
+    def get_cache_groups(self):
+        return ['comments', f'comments:{self.kwargs.get("review_id")}']
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review, id=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id')
-        )
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
 class UserRegistration(APIView):
     """Вью-класс для создания пользователя."""
     permission_classes = [AllowAny]
+    throttle_classes = (AuthThrottle,)
 
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         username = serializer.data['username']
         email = serializer.data['email']
-        user, _ = CustomUser.objects.get_or_create(
-            username=username,
-            email=email
+        with transaction.atomic():
+            user, _ = CustomUser.objects.get_or_create(
+                username=username,
+                email=email
+            )
+            confirmation_code = default_token_generator.make_token(user)
+            user.confirmation_code = confirmation_code
+            user.save()
+            # Письмо уходит из очереди командой send_outbox.
+            enqueue_mail(
+                subject='Код регистрации',
+                message=f'Ваш код для регистрации: {confirmation_code}',
+                from_email=settings.EMAIL_HOST_USER,
+                recipient_list=[email],
+            )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AutocompleteView(APIView):
+    """Вью-класс подсказок по префиксу названия без запросов к базе."""
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        serializer = AutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        kinds = serializer.validated_data.get('type') or autocomplete.kinds
+        return Response(autocomplete.search(
+            serializer.validated_data['q'],
+            [kind for kind in autocomplete.kinds if kind in kinds],
+            serializer.validated_data['limit']
+        ), status=status.HTTP_200_OK)
+
+
+class RequestMetricsView(APIView):
+    """Вью-класс с перцентилями замеров запросов по маршрутам."""
+    permission_classes = (IsAdminOnly,)
+
+    def get(self, request):
+        return Response(metrics_registry.report(), status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        metrics_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ExportView(APIView):
+    """Вью-класс потоковой выгрузки таблицы в NDJSON или CSV.
+
+    Формат выбирается заголовком Accept или параметром `?format=`.
+    """
+    permission_classes = (IsAdminOnly,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+
+    def get(self, request, dataset):
+        if dataset not in EXPORTS:
+            raise NotFound(
+                f'Нет выгрузки {dataset}. Доступны: {", ".join(EXPORTS)}.'
+            )
+        check_streaming(request)
+        renderer = request.accepted_renderer
+        chunk_size = get_chunk_size()
+        columns, rows = export_rows(dataset, chunk_size)
+        response = StreamingHttpResponse(
+            renderer.stream(columns, rows, chunk_size),
+            content_type=request.accepted_media_type
         )
-        confirmation_code = default_token_generator.make_token(user)
-        user.confirmation_code = confirmation_code
-        user.save()
-        send_mail(
-            subject='Код регистрации',
-            message=f'Ваш код для регистрации: {confirmation_code}',
-            from_email=settings.EMAIL_HOST_USER,
-            recipient_list=[email],
+        response['Content-Disposition'] = (
+            'attachment; '
+            f'filename="{get_filename(dataset, renderer.format)}"'
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return response
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthThrottle])
 def get_token(request):
     """Вью-функция для получения токена пользователем."""
     serializer = TokenSerializer(data=request.data)
@@ -147,8 +352,7 @@ def get_token(request):
             CustomUser,
             username=serializer.data.get('username'))
     if serializer.data['confirmation_code'] == user.confirmation_code:
-        refresh = RefreshToken.for_user(user)
-        new_token = {'access': str(refresh.access_token)}
+        new_token = {'access': str(access_token_for(user))}
         return Response(new_token, status=status.HTTP_201_CREATED)
     return Response('Неверный код подтверждения confirmation_code.',
                     status=status.HTTP_400_BAD_REQUEST)
@@ -168,10 +372,14 @@ class AdminUserDetailViewSet(viewsets.ModelViewSet):
     @action(methods=['GET', 'PATCH'], detail=False, url_path='me',
             permission_classes=(IsAuthenticated,))
     def profile(self, request):
-        serializer = UserDetailSerializer(request.user)
+        user = request.user
+        if user.get_deferred_fields():
+            # Пользователь из токена: профилю нужны все поля.
+            user = get_object_or_404(CustomUser, pk=user.pk)
+        serializer = UserDetailSerializer(user)
         if request.method == 'PATCH':
             serializer = UserDetailSerializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True)
             if serializer.is_valid():
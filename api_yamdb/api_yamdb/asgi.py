@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_asgi_application()
+
+# Индекс подсказок собирается в фоне, не дожидаясь первого запроса.
+from api.autocomplete import autocomplete  # noqa: E402
+
+autocomplete.start()
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,13 +95,72 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
 
+    # Пользователь берется из claims токена без запроса к базе
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+
+    # Используют orjson, если он установлен, иначе ведут себя как стандартные
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+
+    # IP для ограничений частоты берется из REMOTE_ADDR: X-Forwarded-For
+    # присылает клиент. За обратным прокси здесь указывается их число.
+    'NUM_PROXIES': 0,
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кеш ответов каталога: алиас из CACHES и время жизни в секундах
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 60 * 5
+# Время жизни версий групп кеша в секундах. ETag отдаются, только если
+# API_CACHE_ALIAS указывает на общий для процессов кеш (Redis, Memcached,
+# база), а не на LocMemCache
+API_CACHE_VERSION_TIMEOUT = 60 * 60 * 24
+
+# Заголовок Server-Timing с замерами RequestMetricsMiddleware
+API_SERVER_TIMING = DEBUG
+
+# Курсорная пагинация для произведений, отзывов и комментариев по умолчанию
+CURSOR_PAGINATION_DEFAULT = False
+
+# Бэкенд поиска по произведениям; None выбирает его по СУБД
+TITLE_SEARCH_BACKEND = None
+
+# Частоты запросов для ограничений из api.throttling: регистрация и токен
+# по IP и имени, изменения отзывов и комментариев по IP и пользователю.
+# Хранилище ведер: 'local' в памяти процесса или 'cache' в кеше API.
+API_THROTTLE_RATES = {
+    'auth': '20/min',
+    'write': '60/min',
 }
+API_THROTTLE_STORAGE = 'local'
+
+# Async-вью чтения произведений, отзывов и комментариев для запуска под
+# ASGI (uvicorn api_yamdb.asgi:application), см. api.asyncviews
+API_ASYNC_READS = False
+
+# Полная пересборка индекса подсказок в каждом процессе, в секундах
+AUTOCOMPLETE_REBUILD_INTERVAL = 60 * 5
+
+# Сколько секунд процесс доверяет закешированной версии токенов
+# пользователя: отзыв в другом процессе действует не позже этого срока
+API_TOKEN_VERSION_TIMEOUT = 30
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=365),
@@ -117,6 +177,10 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 EMAIL_HOST_USER = 'xxx@yandex.ru'
 
+# Письма пишутся в очередь и отправляются командой send_outbox;
+# False отправляет их сразу в запросе
+EMAIL_OUTBOX = True
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_wsgi_application()
+
+# Индекс подсказок собирается в фоне, не дожидаясь первого запроса.
+from api.autocomplete import autocomplete  # noqa: E402
+
+autocomplete.start()
@@ -2,6 +2,7 @@ from django.contrib import admin
 
 from .models import (Category,
                      Genre,
+                     OutboxEmail,
                      Title,
                      TitleGenre,
                      CustomUser)
@@ -17,14 +18,24 @@ class CustomUserAdmin(admin.ModelAdmin):
 
 
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'name', 'year', 'description', 'category')
+    list_display = ('pk', 'name', 'year', 'description', 'category', 'rating')
+    readonly_fields = ('rating_sum', 'rating_count', 'rating')
     search_fields = ('name',)
     list_filter = ('year',)
     empty_value_display = '-пусто-'
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipient', 'subject', 'created', 'send_after',
+                    'attempts', 'sent_at')
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(Category)
 admin.site.register(Genre)
 admin.site.register(Title, TitleAdmin)
 admin.site.register(TitleGenre)
 admin.site.register(CustomUser, CustomUserAdmin)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -1,9 +1,18 @@
 import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import rebuild_ratings
+from reviews.signals import access_changed, notify_catalogue_changed
 
 
 DATABASE = {
@@ -13,25 +22,344 @@ DATABASE = {
     Title.genre.through: 'genre_title.csv',
     Review: 'review.csv',
     Title: 'titles.csv',
-    User: 'users.csv'
+    get_user_model(): 'users.csv'
 }
 
+# Таблицы по именам файлов без расширения, для --tables.
+TABLES = {os.path.splitext(name)[0]: model for model, name in DATABASE.items()}
+# Upsert по умолчанию обновляет только каталог: удаление пользователей,
+# которых нет в users.csv, каскадом удалило бы их отзывы и комментарии.
+CATALOGUE_TABLES = (
+    'category', 'genre', 'titles', 'genre_title', 'review', 'comments'
+)
+
+BATCH_SIZE = 5000
+CHECKPOINT_FILE = 'csv_loader.checkpoint.json'
+
+
+def dependency_levels(models):
+    """Раскладывает модели по уровням графа внешних ключей.
+
+    Модели одного уровня не ссылаются друг на друга и могут загружаться
+    параллельно, каждый уровень зависит только от предыдущих.
+    """
+    dependencies = {
+        model: {
+            field.related_model
+            for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+    levels = []
+    loaded = set()
+    while len(loaded) < len(dependencies):
+        level = [
+            model for model, parents in dependencies.items()
+            if model not in loaded and parents <= loaded
+        ]
+        if not level:
+            raise CommandError('Циклическая зависимость между таблицами')
+        levels.append(level)
+        loaded.update(level)
+    return levels
+
+
+def read_records(file, offset):
+    """Отдает строки CSV вместе со смещением в байтах после каждой."""
+    file.seek(0)
+    header = next(csv.reader([file.readline().decode('utf-8')]))
+    position = max(offset, file.tell())
+    file.seek(position)
+
+    def lines():
+        nonlocal position
+        for line in iter(file.readline, b''):
+            position += len(line)
+            yield line.decode('utf-8')
+
+    for record in csv.reader(lines()):
+        if not record:
+            continue
+        yield dict(zip(header, record)), position
+
+
+class Checkpoint:
+    """Смещения загруженных файлов, сохраняемые после каждой пачки."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.state = json.load(file)
+
+    def get(self, csv_file):
+        return self.state.get(csv_file)
+
+    def save(self, csv_file, **values):
+        with self.lock:
+            self.state[csv_file] = values
+            temporary = f'{self.path}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(self.state, file)
+            os.replace(temporary, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
 
 class Command(BaseCommand):
     help = 'Loading csv_files to DataBase'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одном bulk_create.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Число параллельно загружаемых таблиц '
+                 '(по умолчанию 1 для SQLite и 4 для остальных СУБД).'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=('insert', 'upsert'),
+            default='insert',
+            help='insert загружает пустые таблицы, upsert сверяет файлы '
+                 'с существующими строками по первичным ключам.'
+        )
+        parser.add_argument(
+            '--delete-missing',
+            action='store_true',
+            help='В режиме upsert удалять строки, которых нет в файлах.'
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            choices=sorted(TABLES),
+            default=None,
+            help='Загружаемые таблицы по именам файлов без .csv '
+                 '(по умолчанию все в режиме insert и все, кроме users, '
+                 'в режиме upsert).'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=os.path.join(settings.BASE_DIR, CHECKPOINT_FILE),
+            help='Файл с позициями для продолжения прерванной загрузки.'
+        )
+
     def handle(self, *args, **kwargs):
-        for model, csv_file in DATABASE.items():
-            if model.objects.exists():
-                print('DataBase is already exist')
-                return
-
-            with open(
-                    f'{settings.BASE_DIR}/static/data/{csv_file}',
-                    'r',
-                    encoding='utf-8',
-            ) as file:
-                reader = csv.DictReader(file)
-                for data in reader:
-                    model.objects.get_or_create(**data)
+        self.batch_size = kwargs['batch_size']
+        workers = kwargs['workers']
+        if workers is None:
+            workers = 1 if connection.vendor == 'sqlite' else 4
+        self.checkpoint = Checkpoint(kwargs['checkpoint'])
+        self.upsert = kwargs['mode'] == 'upsert'
+        self.delete = kwargs['delete_missing']
+        self.id_maps = {}
+        self.fields = {}
+        tables = kwargs['tables']
+        if tables is None:
+            tables = CATALOGUE_TABLES if self.upsert else TABLES
+        models = [TABLES[table] for table in tables]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for level in dependency_levels(models):
+                for future in [
+                    executor.submit(self.load_in_thread, model)
+                    for model in level
+                ]:
+                    future.result()
+        self.checkpoint.clear()
+        rebuild_ratings()
+        notify_catalogue_changed(self)
         self.stdout.write(self.style.SUCCESS('Successfully loaded data'))
+
+    def load_in_thread(self, model):
+        try:
+            if self.upsert:
+                self.sync_file(model, DATABASE[model])
+            else:
+                self.load_file(model, DATABASE[model])
+        finally:
+            connection.close()
+
+    def get_ids(self, model):
+        """Возвращает множество первичных ключей уже загруженной модели."""
+        if model not in self.id_maps:
+            self.id_maps[model] = set(
+                model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self.id_maps[model]
+
+    def get_columns(self, model, header):
+        """Сопоставляет колонки CSV с полями модели."""
+        columns = []
+        for column in header:
+            field = model._meta.get_field(column)
+            ids = None
+            if field.is_relation:
+                ids = self.get_ids(field.related_model)
+            columns.append((column, field, ids))
+        return columns
+
+    def build(self, model, columns, row):
+        """Создает объект модели из строки CSV или None для битых ссылок."""
+        values = {}
+        for column, field, ids in columns:
+            value = row[column]
+            if value == '' and field.null:
+                value = None
+            elif ids is not None:
+                value = int(value)
+                if value not in ids:
+                    return None
+            else:
+                value = field.to_python(value)
+            values[field.attname] = value
+        return model(**values)
+
+    def batches(self, model, file, offset):
+        """Отдает пачки объектов, смещение после пачки и число пропусков."""
+        columns = None
+        batch = []
+        skipped = 0
+        for row, position in read_records(file, offset):
+            if columns is None:
+                columns = self.get_columns(model, row.keys())
+                self.fields[model] = [
+                    field for _, field, _ in columns if not field.primary_key
+                ]
+            obj = self.build(model, columns, row)
+            if obj is None:
+                skipped += 1
+            else:
+                batch.append(obj)
+            offset = position
+            if len(batch) >= self.batch_size:
+                yield batch, offset, skipped
+                batch = []
+                skipped = 0
+        yield batch, offset, skipped
+
+    def write_batch(self, model, csv_file, batch, offset, resumed):
+        """Сохраняет пачку и сдвигает контрольную точку файла."""
+        with transaction.atomic():
+            # Пачка могла быть записана до падения, но без контрольной точки.
+            model.objects.bulk_create(batch, ignore_conflicts=resumed)
+        state = self.checkpoint.get(csv_file) or {'rows': 0}
+        self.checkpoint.save(
+            csv_file, offset=offset, rows=state['rows'] + len(batch),
+            done=False
+        )
+
+    def open_file(self, csv_file):
+        return open(f'{settings.BASE_DIR}/static/data/{csv_file}', 'rb')
+
+    def report(self, csv_file, started, loaded, skipped, **counters):
+        elapsed = time.monotonic() - started
+        details = ''.join(
+            f', {value} {name}' for name, value in counters.items()
+        )
+        self.stdout.write(
+            f'{csv_file}: {loaded} rows, {skipped} skipped{details}, '
+            f'{elapsed:.2f}s ({loaded / max(elapsed, 1e-6):.0f} rows/s)'
+        )
+
+    def load_file(self, model, csv_file):
+        """Потоково загружает файл пачками, отмечая пройденные байты."""
+        state = self.checkpoint.get(csv_file)
+        if state is None and model.objects.exists():
+            self.stdout.write(f'{csv_file}: table is already loaded')
+            return
+        if state is not None and state['done']:
+            return
+        offset = state['offset'] if state else 0
+        resumed = offset > 0
+        started = time.monotonic()
+        loaded = skipped = 0
+        with self.open_file(csv_file) as file:
+            for batch, offset, batch_skipped in self.batches(
+                    model, file, offset
+            ):
+                self.write_batch(model, csv_file, batch, offset, resumed)
+                loaded += len(batch)
+                skipped += batch_skipped
+                resumed = False
+        state = self.checkpoint.get(csv_file)
+        self.checkpoint.save(
+            csv_file, offset=offset, rows=state['rows'], done=True
+        )
+        self.report(csv_file, started, loaded, skipped)
+
+    def sync_batch(self, model, batch):
+        """Добавляет новые и обновляет измененные строки пачки."""
+        fields = self.fields.get(model, [])
+        existing = model.objects.in_bulk([obj.pk for obj in batch])
+        # У пользователей изменение полей доступа отзывает их токены.
+        access = [field.attname for field in fields
+                  if field.name in getattr(model, 'ACCESS_FIELDS', ())]
+        created, changed, revoked = [], [], []
+        for obj in batch:
+            current = existing.get(obj.pk)
+            if current is None:
+                created.append(obj)
+            elif any(
+                getattr(current, field.attname) != getattr(obj, field.attname)
+                for field in fields
+            ):
+                changed.append(obj)
+                if any(getattr(current, name) != getattr(obj, name)
+                       for name in access):
+                    revoked.append(obj.pk)
+        with transaction.atomic():
+            model.objects.bulk_create(created)
+            if changed:
+                model.objects.bulk_update(
+                    changed, [field.name for field in fields]
+                )
+            if revoked:
+                access_changed.send(sender=self.__class__, user_ids=revoked)
+        return len(created), len(changed)
+
+    def delete_missing(self, model, seen):
+        """Удаляет строки, первичных ключей которых нет в файле."""
+        deleted = 0
+        pks = model.objects.order_by('pk').values_list('pk', flat=True)
+        missing = []
+        for pk in pks.iterator(chunk_size=self.batch_size):
+            if pk not in seen:
+                missing.append(pk)
+        for start in range(0, len(missing), self.batch_size):
+            chunk = missing[start:start + self.batch_size]
+            deleted += model.objects.filter(pk__in=chunk).delete()[1].get(
+                model._meta.label, 0
+            )
+        return deleted
+
+    def sync_file(self, model, csv_file):
+        """Сверяет файл с таблицей по первичным ключам пачками."""
+        started = time.monotonic()
+        loaded = skipped = created = updated = 0
+        seen = set()
+        with self.open_file(csv_file) as file:
+            for batch, _, batch_skipped in self.batches(model, file, 0):
+                batch_created, batch_updated = self.sync_batch(model, batch)
+                created += batch_created
+                updated += batch_updated
+                loaded += len(batch)
+                skipped += batch_skipped
+                if self.delete:
+                    seen.update(obj.pk for obj in batch)
+        counters = {'created': created, 'updated': updated}
+        if self.delete:
+            counters['deleted'] = self.delete_missing(model, seen)
+        self.report(csv_file, started, loaded, skipped, **counters)
@@ -0,0 +1,241 @@
+import csv
+import datetime as dt
+import os
+import random
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+from reviews.ratings import rebuild_ratings
+from reviews.signals import notify_catalogue_changed
+
+BATCH_SIZE = 5000
+START_DATE = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+WORDS = (
+    'отличный', 'скучный', 'сюжет', 'герой', 'финал', 'музыка', 'актеры',
+    'атмосфера', 'неожиданно', 'рекомендую', 'затянуто', 'шедевр',
+)
+
+
+def distribute(total, count, skew):
+    """Раскладывает total по count позициям по закону Ципфа.
+
+    Отдает количества по одному, не храня их: сумма накопленных весов
+    округляется, поэтому итог ровно равен total.
+    """
+    weight = sum(1 / (rank ** skew) for rank in range(1, count + 1))
+    cumulative = 0.0
+    assigned = 0
+    for rank in range(1, count + 1):
+        cumulative += 1 / (rank ** skew)
+        target = round(total * cumulative / weight)
+        yield target - assigned
+        assigned = target
+
+
+class Dataset:
+    """Потоковые генераторы строк в формате CSV из static/data."""
+
+    def __init__(self, options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+
+    def text(self, words):
+        return ' '.join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def pub_date(self):
+        seconds = self.random.randrange(24 * 365 * 3600 * 24)
+        return (START_DATE + dt.timedelta(seconds=seconds)).isoformat()
+
+    def users(self):
+        roles = ('user',) * 98 + ('moderator', 'admin')
+        for pk in range(1, self.options['users'] + 1):
+            yield {
+                'id': pk,
+                'username': f'user{pk}',
+                'email': f'user{pk}@yamdb.fake',
+                'role': self.random.choice(roles),
+                'bio': '',
+                'first_name': '',
+                'last_name': '',
+            }
+
+    def categories(self):
+        for pk in range(1, self.options['categories'] + 1):
+            yield {'id': pk, 'name': f'Категория {pk}',
+                   'slug': f'category-{pk}'}
+
+    def genres(self):
+        for pk in range(1, self.options['genres'] + 1):
+            yield {'id': pk, 'name': f'Жанр {pk}', 'slug': f'genre-{pk}'}
+
+    def titles(self):
+        for pk in range(1, self.options['titles'] + 1):
+            yield {
+                'id': pk,
+                'name': f'Произведение {pk}',
+                'year': self.random.randint(1900, 2023),
+                'category': self.random.randint(
+                    1, self.options['categories']
+                ),
+            }
+
+    def genre_titles(self):
+        pk = 0
+        genres = range(1, self.options['genres'] + 1)
+        for title in range(1, self.options['titles'] + 1):
+            count = self.random.randint(1, min(3, len(genres)))
+            for genre in self.random.sample(genres, count):
+                pk += 1
+                yield {'id': pk, 'title_id': title, 'genre_id': genre}
+
+    def reviews(self):
+        """Отзывы по Ципфу; авторы внутри произведения не повторяются."""
+        users = self.options['users']
+        pk = surplus = 0
+        counts = distribute(
+            self.options['reviews'], self.options['titles'],
+            self.options['skew']
+        )
+        for title, count in enumerate(counts, 1):
+            # Не больше одного отзыва на пользователя: unique_review.
+            # Что не поместилось, переносится на следующие произведения.
+            count, surplus = min(count + surplus, users), max(
+                count + surplus - users, 0
+            )
+            offset = self.random.randrange(users)
+            for shift in range(count):
+                pk += 1
+                yield {
+                    'id': pk,
+                    'title_id': title,
+                    'text': self.text(self.random.randint(5, 40)),
+                    'author': (offset + shift) % users + 1,
+                    'score': self.random.randint(1, 10),
+                    'pub_date': self.pub_date(),
+                }
+
+    def comments(self, reviews):
+        pk = 0
+        counts = distribute(
+            self.options['comments'], reviews, self.options['skew']
+        )
+        for review, count in enumerate(counts, 1):
+            for _ in range(count):
+                pk += 1
+                yield {
+                    'id': pk,
+                    'review_id': review,
+                    'text': self.text(self.random.randint(3, 20)),
+                    'author': self.random.randint(1, self.options['users']),
+                    'pub_date': self.pub_date(),
+                }
+
+
+class Command(BaseCommand):
+    help = 'Generating a synthetic dataset as CSV files or into DataBase'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=50)
+        parser.add_argument('--titles', type=int, default=100000)
+        parser.add_argument('--reviews', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=1000000)
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help='Показатель Ципфа для популярности произведений и отзывов.'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--output-dir',
+            help='Каталог для CSV в формате csv_loader. '
+                 'Без него данные пишутся прямо в базу.'
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'categories', 'genres', 'titles'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должно быть больше нуля')
+        self.batch_size = options['batch_size']
+        dataset = Dataset(options)
+        tables = (
+            (get_user_model(), 'users.csv', dataset.users),
+            (Category, 'category.csv', dataset.categories),
+            (Genre, 'genre.csv', dataset.genres),
+            (Title, 'titles.csv', dataset.titles),
+            (TitleGenre, 'genre_title.csv', dataset.genre_titles),
+            (Review, 'review.csv', dataset.reviews),
+        )
+        output = options['output_dir']
+        if output is None:
+            self.check_empty([model for model, _, _ in tables] + [Comment])
+        reviews = 0
+        for model, csv_file, rows in tables:
+            count = self.write(model, output, csv_file, rows())
+            if model is Review:
+                reviews = count
+        self.write(
+            Comment, output, 'comments.csv', dataset.comments(reviews)
+        )
+        if output is None:
+            rebuild_ratings()
+            notify_catalogue_changed(self)
+        self.stdout.write(self.style.SUCCESS('Successfully generated data'))
+
+    def check_empty(self, models):
+        filled = [model.__name__ for model in models if model.objects.exists()]
+        if filled:
+            raise CommandError(
+                f'Таблицы уже заполнены: {", ".join(filled)}'
+            )
+
+    def write(self, model, output, csv_file, rows):
+        started = time.monotonic()
+        if output is None:
+            count = self.write_database(model, rows)
+        else:
+            count = self.write_csv(os.path.join(output, csv_file), rows)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{csv_file}: {count} rows, {elapsed:.2f}s '
+            f'({count / max(elapsed, 1e-6):.0f} rows/s)'
+        )
+        return count
+
+    def write_csv(self, path, rows):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(file, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def write_database(self, model, rows):
+        fields = {}
+        count = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return count
+            if not fields:
+                fields = {
+                    column: model._meta.get_field(column).attname
+                    for column in batch[0]
+                }
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    model(**{fields[key]: value for key, value in row.items()})
+                    for row in batch
+                )
+            count += len(batch)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import rebuild_ratings
+from reviews.signals import notify_catalogue_changed
+
+
+class Command(BaseCommand):
+    help = 'Rebuilding stored title ratings from reviews'
+
+    def handle(self, *args, **kwargs):
+        updated = rebuild_ratings()
+        notify_catalogue_changed(self)
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt {updated} ratings')
+        )
@@ -0,0 +1,92 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from reviews.outbox import (BACKOFF_BASE, BATCH_SIZE, LEASE, MAX_ATTEMPTS,
+                            OutboxWorker)
+
+
+class Command(BaseCommand):
+    help = 'Sending queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Число потоков, каждый со своим соединением с почтой.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+        parser.add_argument(
+            '--backoff', type=float, default=BACKOFF_BASE,
+            help='Задержка перед первой повторной попыткой в секундах, '
+                 'дальше она удваивается.'
+        )
+        parser.add_argument(
+            '--lease', type=float, default=LEASE,
+            help='Через сколько секунд письмо, взятое упавшим '
+                 'обработчиком, снова станет доступно.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза между проверками пустой очереди в секундах.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить то, что уже можно отправить, и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers и --batch-size должны быть больше 0')
+        worker = OutboxWorker(
+            batch_size=options['batch_size'],
+            max_attempts=options['max_attempts'],
+            backoff_base=options['backoff'],
+            lease=options['lease']
+        )
+        self.sent = self.failed = 0
+        self.running = set()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=options['workers']
+            ) as executor:
+                try:
+                    self.run(worker, executor, options)
+                except KeyboardInterrupt:
+                    self.stdout.write('Stopping after the running batches')
+                    self.collect(worker, wait(self.running).done)
+        finally:
+            worker.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Sent {self.sent} emails, {self.failed} failed attempts'
+        ))
+
+    def run(self, worker, executor, options):
+        """Берет новые пачки, пока в пуле есть свободный поток."""
+        while True:
+            batch = []
+            if len(self.running) < options['workers']:
+                batch = worker.claim()
+            if batch:
+                self.running.add(executor.submit(worker.send, batch))
+                continue
+            if not self.running:
+                if options['once']:
+                    return
+                close_old_connections()
+                time.sleep(options['interval'])
+                continue
+            self.collect(
+                worker, wait(self.running, return_when=FIRST_COMPLETED).done
+            )
+
+    def collect(self, worker, done):
+        """Записывает результаты отправленных пачек."""
+        for future in done:
+            self.running.discard(future)
+            sent, failed = future.result()
+            worker.mark(sent, failed)
+            self.sent += len(sent)
+            self.failed += len(failed)
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from reviews.search import get_backend
+
+
+def install(apps, schema_editor):
+    get_backend(schema_editor.connection).install(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    get_backend(schema_editor.connection).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_stored_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -1,8 +1,14 @@
+import threading
+from contextlib import contextmanager
+
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .search import SearchDocumentField
+
 
 class CustomUser(AbstractUser):
     """Кастомная модель пользователя."""
@@ -28,9 +34,16 @@ class CustomUser(AbstractUser):
         default=USER
     )
     confirmation_code = models.CharField(max_length=254)
+    # Растет при каждом изменении полей доступа: токены со старой версией
+    # в claims отозваны.
+    token_version = models.PositiveIntegerField(
+        'Версия токенов', default=0
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
+    # Поля, от которых зависят claims и действительность токенов доступа.
+    ACCESS_FIELDS = ('username', 'role', 'is_staff', 'is_active')
 
     class Meta:
         ordering = ['role']
@@ -41,6 +54,16 @@ class CustomUser(AbstractUser):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные поля доступа для отзыва токенов."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_access = instance.access_values()
+        return instance
+
+    def access_values(self):
+        return tuple(self.__dict__.get(field) for field in self.ACCESS_FIELDS)
+
     def is_admin(self):
         return self.is_staff or self.role == "admin"
 
@@ -79,6 +102,40 @@ class Genre(models.Model):
         return self.name
 
 
+# Произведения, удаляемые в текущем потоке: их каскадно удаляемым
+# отзывам незачем пересчитывать рейтинг.
+deleting = threading.local()
+
+
+def deleting_titles():
+    if not hasattr(deleting, 'titles'):
+        deleting.titles = set()
+    return deleting.titles
+
+
+@contextmanager
+def titles_deleting(pks):
+    """Отмечает произведения удаляемыми на время удаления.
+
+    Отметки снимаются и при ошибке удаления, иначе отзывы этих
+    произведений потом удалялись бы без пересчета рейтинга.
+    """
+    titles = deleting_titles()
+    added = set(pks) - titles
+    titles |= added
+    try:
+        yield
+    finally:
+        titles -= added
+
+
+class TitleQuerySet(models.QuerySet):
+
+    def delete(self):
+        with titles_deleting(self.values_list('pk', flat=True)):
+            return super().delete()
+
+
 class Title(models.Model):
     """Модель произведений."""
     name = models.CharField('Наименование произведения', max_length=256)
@@ -96,15 +153,54 @@ class Title(models.Model):
         through='TitleGenre',
         related_name='titles'
     )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок', default=0
+    )
+    rating = models.PositiveSmallIntegerField(
+        'Рейтинг', null=True, blank=True
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
         verbose_name = 'Title'
         verbose_name_plural = 'Titles'
+        indexes = [
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def delete(self, *args, **kwargs):
+        with titles_deleting([self.pk]):
+            return super().delete(*args, **kwargs)
+
+
+class TitleSearchDocument(models.Model):
+    """Строка полнотекстового индекса произведений в SQLite.
+
+    Таблицу FTS5 и триггеры создает `reviews.search`, модель нужна
+    только для соединения с ней в запросах.
+    """
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_document'
+    )
+    document = SearchDocumentField(db_column='reviews_title_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_fts'
+
 
 class TitleGenre(models.Model):
     """Модель отношений прозведение-жанр"""
@@ -118,6 +214,11 @@ class TitleGenre(models.Model):
                 fields=['title', 'genre'],
                 name='unique_title_genre')
         ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='titlegenre_genre_title_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title} - {self.genre}'
@@ -157,6 +258,13 @@ class Review(models.Model):
             )
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженную оценку для пересчета рейтинга."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     """Модель комментариев к отзывам."""
@@ -181,3 +289,31 @@ class Comment(models.Model):
         ordering = ['pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку командой send_outbox."""
+    subject = models.CharField('Тема', max_length=256)
+    message = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель', max_length=254)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    # Время следующей попытки; на время отправки сдвигается вперед,
+    # чтобы письмо не взял другой обработчик.
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ['send_after']
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'send_after'], name='outbox_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.recipient}'
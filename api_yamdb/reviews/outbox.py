@@ -0,0 +1,147 @@
+"""Очередь писем в базе и ее обработчик.
+
+`enqueue_mail` записывает письмо в таблицу OutboxEmail в транзакции
+запроса, поэтому ответ не ждет почтового сервера. Команда send_outbox
+разбирает очередь пачками в пуле потоков: каждый поток держит одно
+открытое соединение с почтовым бэкендом на все свои письма, а с базой
+работает только основной поток команды. Неудачная отправка
+повторяется с экспоненциальной задержкой, после `max_attempts`
+попыток письмо остается в таблице с текстом ошибки.
+
+При `EMAIL_OUTBOX = False` письма отправляются сразу, как send_mail.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 30
+BACKOFF_MAX = 60 * 60
+# На столько сдвигается send_after взятых в работу писем: если обработчик
+# упадет, не успев отметить результат, письма снова станут доступны.
+LEASE = 5 * 60
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    if not getattr(settings, 'EMAIL_OUTBOX', True):
+        return send_mail(subject, message, from_email, recipient_list)
+    OutboxEmail.objects.bulk_create(
+        OutboxEmail(subject=subject, message=message, from_email=from_email,
+                    recipient=recipient)
+        for recipient in recipient_list
+    )
+    return len(recipient_list)
+
+
+def backoff(attempts, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """Задержка перед следующей попыткой: base, 2*base, 4*base..."""
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+class OutboxWorker:
+    """Берет письма из очереди пачками и отправляет их в пуле потоков."""
+
+    def __init__(self, batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS,
+                 backoff_base=BACKOFF_BASE, lease=LEASE):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.lease = lease
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = set()
+
+    def pending(self):
+        return OutboxEmail.objects.filter(
+            sent_at=None,
+            send_after__lte=timezone.now(),
+            attempts__lt=self.max_attempts
+        ).order_by('send_after')
+
+    def claim(self):
+        """Забирает пачку писем, сдвигая их send_after на время аренды."""
+        with transaction.atomic():
+            batch = list(
+                self.pending().select_for_update(skip_locked=True)[
+                    :self.batch_size
+                ]
+            )
+            if batch:
+                OutboxEmail.objects.filter(
+                    pk__in=[email.pk for email in batch]
+                ).update(
+                    send_after=timezone.now() + timedelta(seconds=self.lease)
+                )
+        return batch
+
+    def get_connection(self):
+        """Соединение текущего потока, открытое на все его пачки."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = get_connection()
+            connection.open()
+            self.local.connection = connection
+            with self.lock:
+                self.connections.add(connection)
+        return connection
+
+    def drop_connection(self, connection=None):
+        if connection is None:
+            connection = getattr(self.local, 'connection', None)
+            if connection is None:
+                return
+        self.local.connection = None
+        with self.lock:
+            self.connections.discard(connection)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def send(self, batch):
+        """Отправляет пачку; вызывается в пуле и не обращается к базе."""
+        sent, failed = [], []
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.message, email.from_email,
+                [email.recipient]
+            )
+            try:
+                self.get_connection().send_messages([message])
+            except Exception as error:
+                # Соединение после ошибки может быть в любом состоянии.
+                self.drop_connection()
+                failed.append((email, error))
+            else:
+                sent.append(email.pk)
+        return sent, failed
+
+    def mark(self, sent, failed):
+        """Записывает результаты пачки: отправленные и новые попытки."""
+        now = timezone.now()
+        with transaction.atomic():
+            if sent:
+                OutboxEmail.objects.filter(pk__in=sent).update(sent_at=now)
+            for email, error in failed:
+                attempts = email.attempts + 1
+                OutboxEmail.objects.filter(pk=email.pk).update(
+                    attempts=attempts,
+                    last_error=f'{type(error).__name__}: {error}',
+                    send_after=now + timedelta(seconds=backoff(
+                        attempts, self.backoff_base
+                    ))
+                )
+
+    def close(self):
+        """Закрывает соединения всех потоков."""
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            self.drop_connection(connection)
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models import (Case, Count, F, IntegerField, OuterRef,
+                              Subquery, Sum, When)
+from django.db.models.functions import Coalesce
+
+from .models import Review, Title
+
+RATING_EXPRESSION = Case(
+    When(rating_count=0, then=None),
+    default=F('rating_sum') / F('rating_count'),
+    output_field=IntegerField()
+)
+
+
+def apply_score(title_id, score_delta, count_delta):
+    """Атомарно сдвигает сумму и количество оценок произведения."""
+    with transaction.atomic():
+        titles = Title.objects.filter(pk=title_id)
+        titles.update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta
+        )
+        titles.update(rating=RATING_EXPRESSION)
+
+
+def rebuild_ratings(titles=None):
+    """Пересчитывает сохраненные рейтинги по таблице отзывов."""
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    with transaction.atomic():
+        updated = titles.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            )
+        )
+        titles.update(rating=RATING_EXPRESSION)
+    return updated
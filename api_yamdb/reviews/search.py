@@ -0,0 +1,168 @@
+"""Полнотекстовый поиск по названию и описанию произведений.
+
+Бэкенд выбирается по СУБД соединения или настройкой
+`TITLE_SEARCH_BACKEND` (путь к классу). Индекс создается миграцией
+и поддерживается триггерами и индексами самой СУБД, поэтому остается
+согласованным при любых записях, включая `bulk_create` и `update()`.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, models
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+TITLE_TABLE = 'reviews_title'
+WORD = re.compile(r'\w+')
+
+
+class SearchDocumentField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы: левая часть MATCH."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+def search_words(query):
+    """Слова запроса без служебного синтаксиса СУБД."""
+    return WORD.findall(query.lower())
+
+
+class SearchBackend:
+    """Базовый бэкенд: без индекса и ранжирования, через icontains."""
+
+    def install(self, schema_editor):
+        """Создает индекс и триггеры синхронизации."""
+
+    def uninstall(self, schema_editor):
+        """Удаляет то, что создал install."""
+
+    def search(self, queryset, query):
+        words = search_words(query)
+        if not words:
+            return queryset.none()
+        condition = Q()
+        for word in words:
+            condition &= Q(name__icontains=word) | Q(
+                description__icontains=word
+            )
+        return queryset.filter(condition)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """FTS5 с внешним содержимым из таблицы произведений.
+
+    Название весит в ранжировании больше описания, слова запроса
+    ищутся по префиксу, чтобы находить словоформы.
+    """
+    table = f'{TITLE_TABLE}_fts'
+    weights = (10.0, 1.0)
+
+    def install(self, schema_editor):
+        table = self.table
+        for sql in (
+            f'CREATE VIRTUAL TABLE {table} USING fts5('
+            f'name, description, content={TITLE_TABLE}, content_rowid=id, '
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"INSERT INTO {table}({table}, rank) VALUES ('rank', "
+            f"'bm25({', '.join(map(str, self.weights))})')",
+            f'CREATE TRIGGER {table}_insert AFTER INSERT ON {TITLE_TABLE} '
+            f'BEGIN INSERT INTO {table}(rowid, name, description) '
+            f'VALUES (new.id, new.name, new.description); END',
+            f'CREATE TRIGGER {table}_delete AFTER DELETE ON {TITLE_TABLE} '
+            f"BEGIN INSERT INTO {table}({table}, rowid, name, description) "
+            f"VALUES ('delete', old.id, old.name, old.description); END",
+            f'CREATE TRIGGER {table}_update AFTER UPDATE OF name, description '
+            f"ON {TITLE_TABLE} BEGIN INSERT INTO {table}"
+            f"({table}, rowid, name, description) "
+            f"VALUES ('delete', old.id, old.name, old.description); "
+            f'INSERT INTO {table}(rowid, name, description) '
+            f'VALUES (new.id, new.name, new.description); END',
+            f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+        ):
+            schema_editor.execute(sql)
+
+    def uninstall(self, schema_editor):
+        for trigger in ('insert', 'delete', 'update'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {self.table}_{trigger}'
+            )
+        schema_editor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def match_expression(self, query):
+        return ' '.join(f'"{word}"*' for word in search_words(query))
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        # Соединение с индексом вместо коррелированного подзапроса:
+        # ранг считается за один проход по спискам документов FTS5.
+        return queryset.filter(
+            search_document__document__match=match
+        ).annotate(
+            search_rank=F('search_document__rank')
+        ).order_by('search_rank', 'pk')
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """tsvector по GIN-индексу выражения, ранжирование ts_rank."""
+    index = f'{TITLE_TABLE}_search_idx'
+    config = 'russian'
+
+    @property
+    def vector(self):
+        return (
+            f"setweight(to_tsvector('{self.config}', name), 'A') || "
+            f"setweight(to_tsvector('{self.config}', "
+            f"coalesce(description, '')), 'B')"
+        )
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE INDEX {self.index} ON {TITLE_TABLE} '
+            f'USING gin (({self.vector}))'
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {self.index}')
+
+    def search(self, queryset, query):
+        words = search_words(query)
+        if not words:
+            return queryset.none()
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        match = ' & '.join(f'{word}:*' for word in words)
+        return queryset.filter(RawSQL(
+            f'({self.vector}) @@ {tsquery}', (match,),
+            output_field=BooleanField()
+        )).annotate(search_rank=RawSQL(
+            f'-ts_rank({self.vector}, {tsquery})', (match,),
+            output_field=FloatField()
+        )).order_by('search_rank', 'pk')
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_backend(connection):
+    path = getattr(settings, 'TITLE_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return BACKENDS.get(connection.vendor, SearchBackend)()
+
+
+def search_titles(queryset, query):
+    """Фильтрует произведения по запросу, лучшие совпадения первыми."""
+    return get_backend(connections[queryset.db]).search(queryset, query)
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import Review, Title, deleting_titles
+from .ratings import apply_score, rebuild_ratings
+
+# Отправляется после массовых изменений каталога в обход сигналов моделей.
+# Получатели могут вернуть предупреждение для вывода командой.
+catalogue_changed = Signal()
+# Отправляется после массового изменения полей доступа пользователей
+# (CustomUser.ACCESS_FIELDS) с их первичными ключами в user_ids.
+access_changed = Signal()
+
+
+def notify_catalogue_changed(command):
+    """Отправляет catalogue_changed от команды и выводит предупреждения."""
+    for _, warning in catalogue_changed.send(sender=command.__class__):
+        if warning:
+            command.stderr.write(command.style.WARNING(warning))
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Учитывает новую или измененную оценку в рейтинге произведения."""
+    previous = getattr(instance, '_loaded_score', None)
+    if created:
+        apply_score(instance.title_id, instance.score, 1)
+    elif previous is None:
+        rebuild_ratings(Title.objects.filter(pk=instance.title_id))
+    elif previous != instance.score:
+        apply_score(instance.title_id, instance.score - previous, 0)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Убирает оценку удаленного отзыва из рейтинга произведения."""
+    if instance.title_id in deleting_titles():
+        return
+    score = getattr(instance, '_loaded_score', None) or instance.score
+    apply_score(instance.title_id, -score, -1)
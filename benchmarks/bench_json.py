@@ -0,0 +1,42 @@
+"""Сравнение JSONRenderer и FastJSONRenderer на странице произведений.
+
+Запуск из корня репозитория: python -m benchmarks.bench_json
+"""
+import argparse
+import json
+
+from benchmarks.common import create_titles, measure, setup_django, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import TitleSerializer
+    from reviews.models import Title
+
+    create_titles(args.titles)
+    page = TitleSerializer(
+        Title.objects.select_related('category').prefetch_related('genre'),
+        many=True
+    ).data
+    results = {'orjson': orjson is not None}
+    for renderer in (JSONRenderer(), FastJSONRenderer()):
+        results[type(renderer).__name__] = summary(measure(
+            lambda: renderer.render(page, 'application/json'), args.repeat
+        ))
+    results['speedup'] = (
+        results['JSONRenderer']['mean_ms']
+        / results['FastJSONRenderer']['mean_ms']
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
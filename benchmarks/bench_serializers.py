@@ -0,0 +1,38 @@
+"""Сравнение полных и быстрых сериализаторов чтения на странице.
+
+Запуск из корня репозитория: python -m benchmarks.bench_serializers
+"""
+import argparse
+import json
+
+from benchmarks.common import create_titles, measure, setup_django, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.serializers import TitleReadSerializer, TitleSerializer
+    from reviews.models import Title
+
+    create_titles(args.titles)
+    page = list(
+        Title.objects.select_related('category').prefetch_related('genre')
+    )
+    results = {}
+    for serializer in (TitleSerializer, TitleReadSerializer):
+        results[serializer.__name__] = summary(measure(
+            lambda: serializer(page, many=True).data, args.repeat
+        ))
+    results['speedup'] = (
+        results['TitleSerializer']['mean_ms']
+        / results['TitleReadSerializer']['mean_ms']
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Задержки регистрации при медленной почте: отправка в запросе и очередь.
+
+Запуск из корня репозитория: python -m benchmarks.bench_signup --delay 200
+
+Почтовый бэкенд засыпает на --delay миллисекунд на каждое письмо,
+как медленный SMTP. Режим `sync` отправляет письмо в запросе, режим
+`outbox` только пишет его в очередь; время разбора очереди командой
+send_outbox показано отдельно.
+"""
+import argparse
+import io
+import json
+import time
+
+from django.core.mail.backends.locmem import EmailBackend
+
+from benchmarks.common import setup_django, summary
+
+
+class SlowEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        from django.conf import settings
+
+        time.sleep(settings.BENCH_EMAIL_DELAY * len(messages))
+        return super().send_messages(messages)
+
+
+def signup_timings(client, prefix, count):
+    timings = []
+    for index in range(count):
+        data = {'username': f'{prefix}{index}',
+                'email': f'{prefix}{index}@yamdb.fake'}
+        started = time.perf_counter()
+        response = client.post('/api/v1/auth/signup/', data)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.content
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--delay', type=float, default=200,
+                        help='Задержка почты на письмо в миллисекундах.')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    settings.EMAIL_BACKEND = 'benchmarks.bench_signup.SlowEmailBackend'
+    settings.BENCH_EMAIL_DELAY = args.delay / 1000
+    settings.API_THROTTLE_RATES = {}
+    client = Client()
+    results = {}
+    for mode in ('sync', 'outbox'):
+        settings.EMAIL_OUTBOX = mode == 'outbox'
+        results[mode] = summary(signup_timings(client, mode, args.requests))
+    started = time.perf_counter()
+    call_command('send_outbox', once=True, workers=args.workers,
+                 batch_size=args.batch_size, stdout=io.StringIO())
+    results['outbox_drain_s'] = time.perf_counter() - started
+    results['p99_speedup'] = (
+        results['sync']['p99_ms'] / results['outbox']['p99_ms']
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
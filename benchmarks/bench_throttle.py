@@ -0,0 +1,68 @@
+"""Цена ограничения частоты: одна проверка ведра и запрос целиком.
+
+Запуск из корня репозитория: python -m benchmarks.bench_throttle
+
+Проверка ведра замеряется на `--keys` разных ключах для хранилищ
+`local` и `cache`, запрос — POST на получение токена несуществующего
+пользователя без ограничений и с ними. Частота выбрана так, чтобы
+ни один запрос не получил 429.
+"""
+import argparse
+import itertools
+import json
+
+from benchmarks.common import measure, setup_django, summary
+
+RATE = '1000000/s'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keys', type=int, default=100000)
+    parser.add_argument('--checks', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+
+    from api.throttling import CacheBuckets, LocalBuckets, parse_rate
+
+    capacity, period = parse_rate(RATE)
+    results = {}
+    for name, storage in (('local', LocalBuckets()),
+                          ('cache', CacheBuckets())):
+        keys = itertools.cycle(
+            [f'auth:ip:10.0.{index // 256}.{index % 256}'
+             for index in range(args.keys)]
+        )
+        timings = measure(
+            lambda: storage.take(next(keys), capacity, capacity / period),
+            args.checks
+        )
+        results[f'take_{name}'] = {
+            **summary(timings), 'mean_us': sum(timings) / len(timings) * 1e6
+        }
+
+    client = Client()
+    data = {'username': 'nobody', 'confirmation_code': 1}
+    settings.API_THROTTLE_RATES = {}
+    measure(lambda: client.post('/api/v1/auth/token/', data), 100)
+    for name, rates in (('off', {}), ('local', {'auth': RATE}),
+                        ('cache', {'auth': RATE})):
+        settings.API_THROTTLE_RATES = rates
+        settings.API_THROTTLE_STORAGE = 'local' if name == 'off' else name
+        results[f'request_{name}'] = summary(measure(
+            lambda: client.post('/api/v1/auth/token/', data), args.requests
+        ))
+    for name in ('local', 'cache'):
+        results[f'overhead_{name}_ms'] = (
+            results[f'request_{name}']['mean_ms']
+            - results['request_off']['mean_ms']
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Общие помощники бенчмарков: настройка Django и замеры времени."""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django(database=None):
+    """Настраивает Django и создает пустую базу.
+
+    Без database создается тестовая база в памяти. С путем к файлу
+    используются настройки `benchmarks.settings` и файловая SQLite,
+    которую могут открыть и другие процессы (например, ASGI-сервер).
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    if database is not None:
+        os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+        os.environ['BENCH_DATABASE'] = str(database)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+    import django
+    django.setup()
+
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    if database is not None:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    else:
+        from django.db import connection
+        connection.creation.create_test_db(verbosity=0)
+
+
+def measure(func, repeat=50):
+    """Вызывает func repeat раз и возвращает длительности в секундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def percentile(ordered, value):
+    return ordered[min(len(ordered) - 1, len(ordered) * value // 100)]
+
+
+def summary(timings):
+    ordered = sorted(timings)
+    return {
+        'runs': len(ordered),
+        'mean_ms': statistics.mean(ordered) * 1000,
+        'p50_ms': percentile(ordered, 50) * 1000,
+        'p90_ms': percentile(ordered, 90) * 1000,
+        'p99_ms': percentile(ordered, 99) * 1000,
+    }
+
+
+def create_titles(count):
+    from reviews.models import Category, Genre, Title, TitleGenre
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(5)
+    ]
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {index}',
+            year=1950 + index % 70,
+            description='Описание произведения ' * 10,
+            category=category,
+        )
+        for index in range(count)
+    )
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genre)
+        for title in Title.objects.all()
+        for genre in genres[:3]
+    )
@@ -0,0 +1,334 @@
+"""Нагрузочный прогон основных маршрутов API с отчетом в JSON.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.run_load --target client --output report.json
+    python -m benchmarks.run_load --target wsgi --concurrency 8
+    python -m benchmarks.run_load --target asgi  # нужен uvicorn
+
+Данные генерируются заново во временной SQLite. Отчет содержит
+пропускную способность и перцентили задержек по каждому маршруту,
+чтобы сравнивать релизы между собой.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from benchmarks.common import PROJECT_DIR, setup_django, summary
+
+# Доли маршрутов в сценариях; запись идет от имени случайного пользователя.
+WORKLOADS = {
+    'browse': {
+        'titles-list': 30,
+        'titles-detail': 20,
+        'reviews-list': 20,
+        'comments-list': 10,
+        'categories-list': 5,
+        'genres-list': 5,
+        'titles-filter': 10,
+    },
+    'write': {
+        'comments-create': 1,
+    },
+    'mixed': {
+        'titles-list': 30,
+        'titles-detail': 20,
+        'reviews-list': 25,
+        'comments-list': 15,
+        'comments-create': 10,
+    },
+}
+
+
+def zipf_weights(count, skew):
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def generate(**options):
+    """Заполняет базу командой generate_dataset и возвращает id объектов.
+
+    Команда раздает отзывы по Ципфу в порядке первичных ключей
+    произведений, так что веса сценария совпадают с перекосом данных.
+    """
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from reviews.models import Genre, Review, Title
+
+    call_command(
+        'generate_dataset', categories=3, genres=10, stdout=io.StringIO(),
+        **options
+    )
+    return {
+        'users': list(get_user_model().objects.order_by('pk').values_list(
+            'pk', flat=True
+        )),
+        'titles': list(Title.objects.order_by('pk').values_list(
+            'pk', flat=True
+        )),
+        'reviews': list(Review.objects.order_by('pk').values_list(
+            'pk', 'title_id'
+        )),
+        'genres': list(Genre.objects.values_list('slug', flat=True)),
+        'skew': options['skew'],
+    }
+
+
+class Plan:
+    """Строит случайные запросы сценария с перекосом как в данных."""
+
+    def __init__(self, data, workload, seed):
+        self.data = data
+        self.generator = random.Random(seed)
+        self.routes = list(WORKLOADS[workload])
+        self.route_weights = list(WORKLOADS[workload].values())
+        self.title_weights = zipf_weights(len(data['titles']), data['skew'])
+        self.review_weights = zipf_weights(
+            len(data['reviews']), data['skew']
+        )
+
+    def title(self):
+        return self.generator.choices(
+            self.data['titles'], self.title_weights
+        )[0]
+
+    def review(self):
+        return self.generator.choices(
+            self.data['reviews'], self.review_weights
+        )[0]
+
+    def request(self):
+        route = self.generator.choices(self.routes, self.route_weights)[0]
+        page = self.generator.randint(1, 3)
+        if route == 'titles-list':
+            return route, 'GET', f'/api/v1/titles/?page={page}', None
+        if route == 'titles-filter':
+            genre = self.generator.choice(self.data['genres'])
+            return route, 'GET', f'/api/v1/titles/?genre={genre}', None
+        if route == 'titles-detail':
+            return route, 'GET', f'/api/v1/titles/{self.title()}/', None
+        if route == 'reviews-list':
+            return (route, 'GET',
+                    f'/api/v1/titles/{self.title()}/reviews/', None)
+        if route in ('categories-list', 'genres-list'):
+            return route, 'GET', f'/api/v1/{route.split("-")[0]}/', None
+        review_id, title_id = self.review()
+        comments = f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        if route == 'comments-list':
+            return route, 'GET', comments, None
+        return route, 'POST', comments, {'text': 'Комментарий'}
+
+    def requests(self, count):
+        return [self.request() for _ in range(count)]
+
+
+def auth_headers(data):
+    from django.contrib.auth import get_user_model
+
+    from api.authentication import access_token_for
+
+    user = get_user_model().objects.get(pk=data['users'][0])
+    return {'Authorization': f'Bearer {access_token_for(user)}'}
+
+
+def run_client(requests, headers, concurrency):
+    """Прогоняет запросы через тестовый клиент Django в одном потоке."""
+    from django.test import Client
+
+    client = Client(HTTP_AUTHORIZATION=headers['Authorization'])
+    results = []
+    for route, method, url, body in requests:
+        started = time.perf_counter()
+        if method == 'POST':
+            response = client.post(url, body, content_type='application/json')
+        else:
+            response = client.get(url)
+        results.append(
+            (route, response.status_code, time.perf_counter() - started)
+        )
+    return results
+
+
+def run_http(base_url, requests, headers, concurrency):
+    """Прогоняет запросы по HTTP в concurrency потоков."""
+
+    def send(request):
+        route, method, url, body = request
+        data = json.dumps(body).encode() if body is not None else None
+        http_request = urllib.request.Request(
+            base_url + url, data=data, method=method,
+            headers={**headers, 'Content-Type': 'application/json'}
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(http_request) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            status = error.code
+        return route, status, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(send, requests))
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def run_wsgi(requests, headers, concurrency):
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server(
+        '127.0.0.1', 0, get_wsgi_application(),
+        server_class=ThreadingWSGIServer, handler_class=QuietHandler
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return run_http(
+            f'http://127.0.0.1:{server.server_port}',
+            requests, headers, concurrency
+        )
+    finally:
+        server.shutdown()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_asgi(requests, headers, concurrency):
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        sys.exit('Для --target asgi установите uvicorn.')
+    port = free_port()
+    root = Path(__file__).resolve().parent.parent
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join((str(root), str(PROJECT_DIR))),
+    }
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api_yamdb.asgi:application',
+         '--port', str(port), '--log-level', 'warning'],
+        env=env
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), 1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    sys.exit('ASGI-сервер не запустился.')
+                time.sleep(0.1)
+        return run_http(
+            f'http://127.0.0.1:{port}', requests, headers, concurrency
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+TARGETS = {'client': run_client, 'wsgi': run_wsgi, 'asgi': run_asgi}
+
+
+def report(results, elapsed):
+    by_route = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    for route, status, duration in results:
+        by_route[route].append(duration)
+        statuses[route][status] += 1
+    return {
+        'requests': len(results),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(results) / elapsed if elapsed else 0,
+        'latency': summary([duration for _, _, duration in results]),
+        'routes': {
+            route: {**summary(timings), 'statuses': dict(statuses[route])}
+            for route, timings in sorted(by_route.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--target', choices=TARGETS, default='client')
+    parser.add_argument('--workload', choices=WORKLOADS, default='browse')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--comments', type=int, default=5000)
+    parser.add_argument('--skew', type=float, default=1.1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Файл для JSON-отчета.')
+    parser.add_argument(
+        '--db-latency', type=float, default=0,
+        help='Задержка каждого SQL-запроса сервера в миллисекундах.'
+    )
+    parser.add_argument(
+        '--async-reads', action='store_true',
+        help='Включить API_ASYNC_READS (имеет смысл с --target asgi).'
+    )
+    args = parser.parse_args()
+
+    if args.async_reads:
+        os.environ['BENCH_ASYNC_READS'] = '1'
+    os.environ['BENCH_DB_LATENCY'] = str(args.db_latency)
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(database=Path(directory) / 'bench.sqlite3')
+        started = time.perf_counter()
+        data = generate(
+            users=args.users, titles=args.titles, reviews=args.reviews,
+            comments=args.comments, skew=args.skew, seed=args.seed
+        )
+        generated = time.perf_counter() - started
+        requests = Plan(data, args.workload, args.seed).requests(
+            args.requests
+        )
+        headers = auth_headers(data)
+        started = time.perf_counter()
+        results = TARGETS[args.target](requests, headers, args.concurrency)
+        elapsed = time.perf_counter() - started
+
+    result = {
+        'parameters': vars(args),
+        'generate_s': generated,
+        **report(results, elapsed),
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Настройки проекта для бенчмарков: файловая SQLite из BENCH_DATABASE.
+
+BENCH_DB_LATENCY добавляет каждому SQL-запросу задержку в миллисекундах,
+как у базы на другой машине.
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+from api_yamdb.settings import *  # noqa: F401,F403
+
+DEBUG = False
+API_ASYNC_READS = os.environ.get('BENCH_ASYNC_READS') == '1'
+API_SERVER_TIMING = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BENCH_DATABASE', ':memory:'),
+    }
+}
+# Нагрузку создает один пользователь, лимиты исказили бы замеры.
+API_THROTTLE_RATES = {}
+
+DB_LATENCY = float(os.environ.get('BENCH_DB_LATENCY', 0)) / 1000
+
+
+def slow_query(execute, sql, params, many, context):
+    time.sleep(DB_LATENCY)
+    return execute(sql, params, many, context)
+
+
+def add_latency(sender, connection, **kwargs):
+    if slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query)
+
+
+if DB_LATENCY:
+    connection_created.connect(add_latency)
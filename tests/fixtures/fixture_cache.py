@@ -0,0 +1,27 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from api.authentication import token_versions
+    from api.autocomplete import autocomplete
+    from api.throttling import local_buckets
+
+    for cache in caches.all():
+        cache.clear()
+    autocomplete.reset()
+    local_buckets.reset()
+    token_versions.reset()
+    yield
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Кеш API в файлах: его, как Redis в продакшене, видят все процессы."""
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }
+    }
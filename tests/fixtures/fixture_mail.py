@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def synchronous_mail(settings):
+    """Письма сразу попадают в mail.outbox, минуя очередь в базе.
+
+    Тесты очереди включают ее сами через `settings.EMAIL_OUTBOX`.
+    """
+    settings.EMAIL_OUTBOX = False
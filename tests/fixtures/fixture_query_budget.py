@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SEED_SIZE = 60
+
+
+@pytest.fixture
+def query_budget():
+    """Контекстный менеджер, падающий при превышении числа SQL-запросов."""
+
+    @contextmanager
+    def budget(limit, label=''):
+        with CaptureQueriesContext(connection) as queries:
+            yield queries
+        assert len(queries) <= limit, (
+            f'{label}: выполнено {len(queries)} SQL-запросов при бюджете '
+            f'{limit}:\n' + '\n'.join(
+                query['sql'] for query in queries.captured_queries
+            )
+        )
+
+    return budget
+
+
+@pytest.fixture
+def catalogue(admin, moderator, user, django_user_model):
+    """Наполняет базу каталогом из SEED_SIZE объектов каждого вида.
+
+    Первому произведению достаются отзывы всех авторов, первому отзыву —
+    комментарии всех авторов, чтобы списки были длиннее одной страницы.
+    """
+    from reviews.models import (Category, Comment, Genre, Review, Title,
+                                TitleGenre)
+    from reviews.ratings import rebuild_ratings
+
+    django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'author{index}', email=f'author{index}@yamdb.fake'
+        )
+        for index in range(SEED_SIZE)
+    )
+    authors = list(django_user_model.objects.filter(
+        username__startswith='author'
+    ).order_by('pk'))
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(5)
+    )
+    categories = list(Category.objects.order_by('pk'))
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(10)
+    )
+    genres = list(Genre.objects.order_by('pk'))
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {index}',
+            year=1950 + index,
+            description='Описание',
+            category=categories[index % len(categories)]
+        )
+        for index in range(SEED_SIZE)
+    )
+    titles = list(Title.objects.order_by('pk'))
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genres[(title.pk + shift) % len(genres)])
+        for title in titles
+        for shift in range(3)
+    )
+    Review.objects.bulk_create(
+        Review(title=titles[0], author=author, text='Отзыв', score=7)
+        for author in authors
+    )
+    review = Review.objects.order_by('pk').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text='Комментарий')
+        for author in authors
+    )
+    rebuild_ratings()
+    django_user_model.objects.filter(pk=authors[-1].pk).update(
+        confirmation_code='budget-code'
+    )
+    return {
+        'title': titles[0].pk,
+        'review': review.pk,
+        'comment': review.comments.order_by('pk').first().pk,
+        'category': categories[0].slug,
+        'genre': genres[0].slug,
+        'username': authors[-1].username,
+        'code': 'budget-code',
+    }
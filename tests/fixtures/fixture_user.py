@@ -1,6 +1,5 @@
 import pytest
 from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import AccessToken
 
 
 @pytest.fixture
@@ -49,7 +48,9 @@ def user(django_user_model):
 
 @pytest.fixture
 def token_user_superuser(user_superuser):
-    token = AccessToken.for_user(user_superuser)
+    from api.authentication import access_token_for
+
+    token = access_token_for(user_superuser)
     return {
         'access': str(token),
     }
@@ -66,7 +67,9 @@ def user_superuser_client(token_user_superuser):
 
 @pytest.fixture
 def token_admin(admin):
-    token = AccessToken.for_user(admin)
+    from api.authentication import access_token_for
+
+    token = access_token_for(admin)
     return {
         'access': str(token),
     }
@@ -81,7 +84,9 @@ def admin_client(token_admin):
 
 @pytest.fixture
 def token_moderator(moderator):
-    token = AccessToken.for_user(moderator)
+    from api.authentication import access_token_for
+
+    token = access_token_for(moderator)
     return {
         'access': str(token),
     }
@@ -98,7 +103,9 @@ def moderator_client(token_moderator):
 
 @pytest.fixture
 def token_user(user):
-    token = AccessToken.for_user(user)
+    from api.authentication import access_token_for
+
+    token = access_token_for(user)
     return {
         'access': str(token),
     }
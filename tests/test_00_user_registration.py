@@ -272,6 +272,38 @@ class Test00UserRegistration:
             ', возвращает ответ со статусом 400.'
         )
 
+    def test_00_obtain_jwt_token_valid_code(self, client):
+        valid_data = {
+            'email': 'valid@yamdb.fake',
+            'username': 'valid_username'
+        }
+        mail.outbox.clear()
+        response = client.post(self.url_signup, data=valid_data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 1
+        code = mail.outbox[0].body.rsplit(' ', 1)[-1].strip()
+
+        response = client.post(self.url_token, data={
+            'username': valid_data['username'],
+            'confirmation_code': code
+        })
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос с `username` и кодом из письма, '
+            f'отправленный на эндпоинт `{self.url_token}`, возвращает ответ '
+            'со статусом 201.'
+        )
+        token = response.json().get('access')
+        assert token, (
+            f'Проверьте, что ответ на POST-запрос к `{self.url_token}` '
+            'содержит токен в поле `access`.'
+        )
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что полученный токен принимается API.'
+        )
+
     def test_00_registration_me_username_restricted(self, client):
         valid_data = {
             'email': 'valid@yamdb.fake',
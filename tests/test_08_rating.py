@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/{{}}/'
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при создании отзыва.'
+        )
+
+        admin_client.patch(url.format(reviews[0]['id']), data={'score': 9})
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при изменении оценки в отзыве.'
+        )
+
+        admin_client.delete(url.format(reviews[1]['id']))
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при удалении отзыва.'
+        )
+
+        admin_client.delete(url.format(reviews[0]['id']))
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов нет рейтинга.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin,
+                                        user_client, user):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            10, 2, 5
+        ), 'Команда `rebuild_ratings` должна пересчитать рейтинги.'
+
+    def test_03_failed_title_delete(self, admin_client, admin,
+                                    user_client, user):
+        from django.db.models.signals import post_delete
+        from reviews.models import Review, Title
+
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+
+        def fail(sender, **kwargs):
+            raise RuntimeError('Удаление прервано')
+
+        post_delete.connect(fail, sender=Review)
+        try:
+            with pytest.raises(RuntimeError):
+                Title.objects.get(pk=title_id).delete()
+        finally:
+            post_delete.disconnect(fail, sender=Review)
+        assert Title.objects.filter(pk=title_id).exists()
+
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (5, 1), (
+            'Проверьте, что после прерванного удаления произведения '
+            'удаление его отзывов пересчитывает рейтинг.'
+        )
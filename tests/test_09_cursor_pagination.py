@@ -0,0 +1,75 @@
+import json
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+from api.pagination import KeysetPagination
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    def crawl(self, client, url):
+        results = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` в режиме курсора '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'В режиме курсора ответ не должен содержать ключ `count`.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_titles_cursor(self, client, admin_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        monkeypatch.setattr(KeysetPagination, 'page_size', 1)
+        results = self.crawl(client, '/api/v1/titles/?pagination=cursor')
+        assert [title['name'] for title in results] == sorted(
+            title['name'] for title in titles
+        ), 'Проверьте, что курсор обходит произведения в порядке `name`.'
+
+    def test_02_comments_cursor(self, client, admin_client, admin,
+                                user_client, user, moderator_client,
+                                moderator, monkeypatch):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        monkeypatch.setattr(KeysetPagination, 'page_size', 2)
+        results = self.crawl(
+            client,
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/?pagination=cursor'
+        )
+        assert [comment['id'] for comment in results] == [
+            comment['id'] for comment in comments
+        ], 'Проверьте, что курсор обходит все комментарии по порядку.'
+
+    def test_03_invalid_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        reviews = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url, values in (
+            ('/api/v1/titles/', ['a', 'x']),
+            ('/api/v1/titles/', {'a': 1, 'b': 2}),
+            ('/api/v1/titles/', ['a', None]),
+            ('/api/v1/titles/', [['a'], 1]),
+            ('/api/v1/titles/', ['a']),
+            (reviews, ['не дата', 1]),
+        ):
+            cursor = urlsafe_b64encode(json.dumps(values).encode()).decode()
+            response = client.get(f'{url}?cursor={cursor}')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что курсор {values} к `{url}` возвращает '
+                'ответ со статусом 404.'
+            )
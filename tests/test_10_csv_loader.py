@@ -0,0 +1,104 @@
+import csv
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CsvLoader:
+
+    def test_01_load_and_upsert(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        call_command('csv_loader', batch_size=10, checkpoint=checkpoint)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что `csv_loader` загружает все отзывы.'
+        )
+        assert Comment.objects.exists()
+        assert not Title.objects.filter(
+            reviews__isnull=False, rating=None
+        ).exists(), 'После загрузки рейтинги должны быть пересчитаны.'
+
+        review = Review.objects.get(pk=1)
+        Review.objects.filter(pk=1).update(score=1)
+        Title.objects.create(name='Лишнее произведение', year=2000)
+        call_command(
+            'csv_loader', mode='upsert', delete_missing=True,
+            checkpoint=checkpoint
+        )
+        assert Review.objects.get(pk=1).score == review.score, (
+            'Проверьте, что режим upsert обновляет измененные строки.'
+        )
+        assert not Title.objects.filter(
+            name='Лишнее произведение'
+        ).exists(), (
+            'Проверьте, что `--delete-missing` удаляет строки, '
+            'которых нет в файле.'
+        )
+
+    def test_02_resume_after_failure(self, tmp_path, monkeypatch):
+        from reviews.management.commands import csv_loader
+        from reviews.models import Review
+
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        save = csv_loader.Checkpoint.save
+        calls = []
+
+        def failing_save(self, csv_file, **values):
+            # Третья пачка отзывов записана в базу, но контрольная точка
+            # осталась на второй: повтор должен пропустить дубликаты.
+            if csv_file == 'review.csv' and not values['done']:
+                calls.append(values)
+                if len(calls) == 3:
+                    raise RuntimeError('Загрузка прервана')
+            return save(self, csv_file, **values)
+
+        monkeypatch.setattr(csv_loader.Checkpoint, 'save', failing_save)
+        with pytest.raises(RuntimeError):
+            call_command('csv_loader', batch_size=10, checkpoint=checkpoint)
+        assert Review.objects.count() == 30
+        monkeypatch.setattr(csv_loader.Checkpoint, 'save', save)
+
+        call_command('csv_loader', batch_size=10, checkpoint=checkpoint)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что продолжение загрузки дописывает все отзывы '
+            'с многострочными полями без повторов.'
+        )
+        with open(f'{settings.BASE_DIR}/static/data/review.csv',
+                  encoding='utf-8') as file:
+            ids = {int(row['id']) for row in csv.DictReader(file)}
+        assert set(Review.objects.values_list('pk', flat=True)) == ids, (
+            'Проверьте, что после продолжения в базе ровно отзывы из файла.'
+        )
+
+    def test_03_dependency_levels(self):
+        from django.contrib.auth import get_user_model
+
+        from reviews.management.commands.csv_loader import (
+            DATABASE, dependency_levels)
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        levels = [set(level) for level in dependency_levels(DATABASE)]
+        assert levels == [
+            {Category, Genre, get_user_model()},
+            {Title},
+            {Title.genre.through, Review},
+            {Comment},
+        ], 'Проверьте, что таблицы загружаются после тех, на которые ссылаются.'
+
+    def test_04_upsert_keeps_users(self, django_user_model, tmp_path):
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        call_command('csv_loader', checkpoint=checkpoint)
+        admin = django_user_model.objects.create_superuser(
+            username='root', email='root@yamdb.fake', password='root'
+        )
+        call_command(
+            'csv_loader', mode='upsert', delete_missing=True,
+            checkpoint=checkpoint
+        )
+        assert django_user_model.objects.filter(pk=admin.pk).exists(), (
+            'Проверьте, что `--mode=upsert --delete-missing` по умолчанию '
+            'не трогает пользователей, которых нет в users.csv.'
+        )
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import io
+
+import pytest
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    def test_01_repeated_list_hits_cache(self, client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 0, (
+            'Повторный GET-запрос к `/api/v1/titles/` должен отдаваться '
+            'из кеша без запросов к базе.'
+        )
+
+    def test_02_writes_invalidate(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        client.get('/api/v1/genres/')
+
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        assert client.get(url).json()['rating'] == 8, (
+            'Новый отзыв должен сбрасывать кеш карточки произведения.'
+        )
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Фэнтези', 'slug': 'fantasy'}
+        )
+        assert client.get('/api/v1/genres/').json()['count'] == 4, (
+            'Новый жанр должен сбрасывать кеш списка жанров.'
+        )
+
+    def test_03_other_titles_stay_cached(self, client, admin_client, admin,
+                                         user_client, user):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        client.get(url)
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        assert len(queries) == 0, (
+            'Отзыв к одному произведению не должен сбрасывать кеш '
+            'карточки другого.'
+        )
+
+    def test_04_command_warns_about_local_cache(self, settings, tmp_path):
+        stderr = io.StringIO()
+        call_command('rebuild_ratings', stdout=io.StringIO(), stderr=stderr)
+        assert 'API_CACHE_ALIAS' in stderr.getvalue(), (
+            'Проверьте, что команды предупреждают: с кешем в памяти '
+            'процесса их сброс не доходит до сервера.'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+        stderr = io.StringIO()
+        call_command('rebuild_ratings', stdout=io.StringIO(), stderr=stderr)
+        assert not stderr.getvalue(), (
+            'Проверьте, что с общим кешем команды не предупреждают.'
+        )
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('shared_cache')
+class Test12ConditionalGet:
+
+    def test_01_not_modified(self, client, admin_client, admin,
+                             user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}'
+            '/comments/',
+        )
+        for url in urls:
+            response = client.get(url)
+            etag = response.get('ETag')
+            assert etag, f'Проверьте, что ответ на GET к `{url}` содержит ETag.'
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET к `{url}` с актуальным If-None-Match '
+                'возвращает 304.'
+            )
+            assert len(queries) == 0
+
+    def test_02_etag_changes_on_write(self, client, admin_client, admin,
+                                      user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        create_single_review(admin_client, titles[0]['id'], 'text', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Новый отзыв должен менять ETag списка отзывов.'
+        )
+        assert response['ETag'] != etag
+
+    def test_03_etag_changes_on_rename(self, client, admin_client,
+                                       user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        review = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}'
+        urls = (f'{review}/', f'{review}/comments/')
+        etags = [client.get(url)['ETag'] for url in urls]
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что смена имени автора меняет ETag `{url}`.'
+            )
+            assert 'renamed' in response.content.decode()
+
+    def test_04_no_etag_with_local_cache(self, client, settings):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'ETag' not in response, (
+            'Проверьте, что с кешем в памяти процесса ETag не отдается: '
+            'версии в нем не сдвигаются записями в других процессах.'
+        )
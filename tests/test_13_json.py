@@ -0,0 +1,51 @@
+import datetime as dt
+import io
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+SAMPLE = OrderedDict([
+    ('id', 1),
+    ('name', 'Побег из Шоушенка\u2028\u2029'),
+    ('rating', None),
+    ('score', 7.5),
+    ('price', Decimal('1.10')),
+    ('pub_date', dt.datetime(2020, 1, 13, 23, 20, 2, 422015,
+                             tzinfo=dt.timezone.utc)),
+    ('day', dt.date(2020, 1, 13)),
+    ('lazy', gettext_lazy('Отзыв')),
+    ('genre', [OrderedDict([('name', 'Драма'), ('slug', 'drama')])]),
+    (5, 'int key'),
+])
+
+
+class Test13FastJSON:
+
+    @pytest.mark.parametrize('use_orjson', (True, False))
+    def test_01_renderer_matches_drf(self, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        elif renderers.orjson is None:
+            pytest.skip('orjson не установлен')
+        for media_type in ('application/json',
+                           'application/json; indent=4'):
+            assert FastJSONRenderer().render(SAMPLE, media_type) == (
+                JSONRenderer().render(SAMPLE, media_type)
+            )
+
+    def test_02_parser_matches_drf(self):
+        body = JSONRenderer().render(SAMPLE)
+        assert FastJSONParser().parse(io.BytesIO(body)) == (
+            JSONParser().parse(io.BytesIO(body))
+        )
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"broken": '))
@@ -0,0 +1,45 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ReadSerializers:
+
+    def assert_same(self, fast, full, queryset):
+        render = JSONRenderer().render
+        assert render(fast(queryset, many=True).data) == (
+            render(full(queryset, many=True).data)
+        ), (
+            f'Проверьте, что {fast.__name__} отдает тот же JSON, '
+            f'что и {full.__name__}.'
+        )
+        for obj in queryset:
+            assert render(fast(obj).data) == render(full(obj).data)
+
+    def test_01_parity(self, admin_client, admin, user_client, user):
+        from api.serializers import (CommentReadSerializer,
+                                     CommentSerializer,
+                                     ReviewReadSerializer,
+                                     ReviewSerializer,
+                                     TitleReadSerializer,
+                                     TitleSerializer)
+        from reviews.models import Category, Comment, Review, Title
+
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        Title.objects.create(name='Без категории', year=2000)
+        Category.objects.filter(slug='books').delete()
+
+        self.assert_same(
+            TitleReadSerializer, TitleSerializer,
+            Title.objects.select_related('category').prefetch_related('genre')
+        )
+        self.assert_same(
+            ReviewReadSerializer, ReviewSerializer,
+            Review.objects.select_related('author')
+        )
+        self.assert_same(
+            CommentReadSerializer, CommentSerializer,
+            Comment.objects.select_related('author')
+        )
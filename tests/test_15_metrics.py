@@ -0,0 +1,35 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15RequestMetrics:
+
+    def test_01_metrics_report(self, client, admin_client, user_client,
+                               settings):
+        settings.API_SERVER_TIMING = True
+        admin_client.delete('/api/v1/metrics/')
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert 'db;dur=' in response['Server-Timing'], (
+            'Проверьте, что ответ содержит заголовок Server-Timing.'
+        )
+
+        assert client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        report = admin_client.get('/api/v1/metrics/').json()
+        titles = report.get('api:titles-list', {}).get('GET')
+        assert titles and titles['count'] == 1, (
+            'Проверьте, что замеры копятся по имени маршрута.'
+        )
+        assert titles['queries']['p50'] > 0
+        assert set(titles) == {
+            'count', 'queries', 'sql_ms', 'render_ms', 'total_ms'
+        }
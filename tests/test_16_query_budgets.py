@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import URLPattern, URLResolver
+
+from api.pagination import KeysetPagination
+from api.urls import urlpatterns
+
+TITLE = '/api/v1/titles/{title}/'
+REVIEWS = TITLE + 'reviews/'
+REVIEW = REVIEWS + '{review}/'
+COMMENTS = REVIEW + 'comments/'
+COMMENT = COMMENTS + '{comment}/'
+
+# Маршрут, метод, URL, данные запроса, ожидаемый статус ответа
+# и допустимое число SQL-запросов.
+# Бюджет не зависит от размера страницы: рост числа запросов вместе
+# со страницей означает N+1.
+BUDGETS = (
+    ('api-root', 'get', '/api/v1/', None, HTTPStatus.OK, 0),
+    ('signup', 'post', '/api/v1/auth/signup/',
+     {'username': 'newbie', 'email': 'newbie@yamdb.fake'}, HTTPStatus.OK, 7),
+    ('token', 'post', '/api/v1/auth/token/',
+     {'username': '{username}', 'confirmation_code': '{code}'},
+     HTTPStatus.CREATED, 1),
+    ('metrics', 'get', '/api/v1/metrics/', None, HTTPStatus.OK, 0),
+    # Первый запрос строит индекс подсказок, дальше база не нужна.
+    ('autocomplete', 'get', '/api/v1/autocomplete/?q=title', None,
+     HTTPStatus.OK, 4),
+    # Строки выгрузки читаются одним запросом уже при отдаче тела.
+    ('export', 'get', '/api/v1/export/reviews/', None, HTTPStatus.OK, 1),
+    ('categories-list', 'get', '/api/v1/categories/', None, HTTPStatus.OK, 2),
+    ('categories-list', 'post', '/api/v1/categories/',
+     {'name': 'Музыка', 'slug': 'music'}, HTTPStatus.CREATED, 3),
+    ('categories-detail', 'delete', '/api/v1/categories/{category}/',
+     None, HTTPStatus.NO_CONTENT, 5),
+    ('categories-bulk', 'post', '/api/v1/categories/bulk/',
+     [{'name': f'Категория {index}', 'slug': f'bulk-{index}'}
+      for index in range(100, 120)], HTTPStatus.CREATED, 3),
+    ('genres-list', 'get', '/api/v1/genres/', None, HTTPStatus.OK, 2),
+    ('genres-list', 'post', '/api/v1/genres/',
+     {'name': 'Рок', 'slug': 'rock'}, HTTPStatus.CREATED, 3),
+    ('genres-detail', 'delete', '/api/v1/genres/{genre}/', None,
+     HTTPStatus.NO_CONTENT, 5),
+    ('genres-bulk', 'post', '/api/v1/genres/bulk/',
+     [{'name': f'Жанр {index}', 'slug': f'bulk-{index}'}
+      for index in range(100, 120)], HTTPStatus.CREATED, 3),
+    ('titles-list', 'get', '/api/v1/titles/', None, HTTPStatus.OK, 3),
+    ('titles-list', 'post', '/api/v1/titles/',
+     {'name': 'Новое', 'year': 2000, 'category': '{category}',
+      'genre': ['{genre}']}, HTTPStatus.CREATED, 9),
+    ('titles-bulk', 'post', '/api/v1/titles/bulk/',
+     [{'name': f'Пачка {index}', 'year': 2000, 'category': '{category}',
+       'genre': ['{genre}']} for index in range(20)], HTTPStatus.CREATED, 8),
+    ('titles-detail', 'get', TITLE, None, HTTPStatus.OK, 2),
+    ('titles-detail', 'patch', TITLE, {'name': 'Другое'}, HTTPStatus.OK, 5),
+    ('titles-detail', 'delete', TITLE, None, HTTPStatus.NO_CONTENT, 10),
+    ('reviews-list', 'get', REVIEWS, None, HTTPStatus.OK, 2),
+    ('reviews-list', 'post', REVIEWS, {'text': 'Отзыв', 'score': 5},
+     HTTPStatus.CREATED, 5),
+    ('reviews-detail', 'get', REVIEW, None, HTTPStatus.OK, 1),
+    ('reviews-detail', 'patch', REVIEW, {'score': 3}, HTTPStatus.OK, 5),
+    ('reviews-detail', 'delete', REVIEW, None, HTTPStatus.NO_CONTENT, 9),
+    ('comments-list', 'get', COMMENTS, None, HTTPStatus.OK, 2),
+    ('comments-list', 'post', COMMENTS, {'text': 'Комментарий'},
+     HTTPStatus.CREATED, 2),
+    ('comments-detail', 'get', COMMENT, None, HTTPStatus.OK, 1),
+    ('comments-detail', 'patch', COMMENT, {'text': 'Другой'},
+     HTTPStatus.OK, 2),
+    ('comments-detail', 'delete', COMMENT, None, HTTPStatus.NO_CONTENT, 3),
+    ('users-list', 'get', '/api/v1/users/', None, HTTPStatus.OK, 2),
+    ('users-list', 'post', '/api/v1/users/',
+     {'username': 'created', 'email': 'created@yamdb.fake'},
+     HTTPStatus.CREATED, 3),
+    ('users-detail', 'get', '/api/v1/users/{username}/', None,
+     HTTPStatus.OK, 1),
+    ('users-detail', 'patch', '/api/v1/users/{username}/',
+     {'bio': 'bio'}, HTTPStatus.OK, 2),
+    ('users-detail', 'delete', '/api/v1/users/{username}/', None,
+     HTTPStatus.NO_CONTENT, 16),
+    ('users-profile', 'get', '/api/v1/users/me/', None, HTTPStatus.OK, 1),
+    ('users-profile', 'patch', '/api/v1/users/me/', {'bio': 'bio'},
+     HTTPStatus.OK, 2),
+)
+
+
+def route_names(patterns, namespace='api'):
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def fill(value, objects):
+    if isinstance(value, str):
+        return value.format(**objects)
+    if isinstance(value, list):
+        return [fill(item, objects) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, objects) for key, item in value.items()}
+    return value
+
+
+def test_every_route_has_budget():
+    missing = route_names(urlpatterns) - {name for name, *_ in BUDGETS}
+    assert not missing, f'Не заданы бюджеты SQL-запросов для {missing}'
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('page_size', (10, 50))
+@pytest.mark.parametrize(
+    'name, method, url, data, status, budget', BUDGETS,
+    ids=[f'{name}-{method}' for name, method, *_ in BUDGETS]
+)
+def test_query_budget(admin_client, catalogue, query_budget, monkeypatch,
+                      page_size, name, method, url, data, status, budget):
+    monkeypatch.setattr(
+        'rest_framework.pagination.PageNumberPagination.page_size', page_size
+    )
+    monkeypatch.setattr(KeysetPagination, 'page_size', page_size)
+    url = fill(url, catalogue)
+    data = fill(data, catalogue)
+    kwargs = {'format': 'json'} if data is not None else {}
+    with query_budget(budget, f'{method.upper()} {url}'):
+        response = getattr(admin_client, method)(url, data, **kwargs)
+        if response.streaming:
+            # Потоковый ответ читает базу, пока отдается тело.
+            b''.join(response.streaming_content)
+    assert response.status_code == status, (
+        f'{method.upper()} {url}: бюджет замерен не на том ответе, '
+        f'статус {response.status_code}.'
+    )
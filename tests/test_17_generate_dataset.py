@@ -0,0 +1,53 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+SCALE = {
+    'users': 20, 'categories': 3, 'genres': 5, 'titles': 30,
+    'reviews': 300, 'comments': 100, 'batch_size': 50,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17GenerateDataset:
+
+    def test_01_database(self):
+        from django.db.models import Count
+        from reviews.models import Comment, Review, Title
+
+        call_command('generate_dataset', **SCALE)
+        assert Title.objects.count() == SCALE['titles']
+        assert Review.objects.count() == SCALE['reviews'], (
+            'Проверьте, что генератор создает заданное число отзывов.'
+        )
+        assert Comment.objects.count() == SCALE['comments']
+        assert not Review.objects.values('title', 'author').annotate(
+            count=Count('id')
+        ).filter(count__gt=1).exists(), (
+            'Проверьте, что на произведение приходится не больше одного '
+            'отзыва от пользователя.'
+        )
+        assert not Title.objects.filter(
+            reviews__isnull=False, rating=None
+        ).exists(), 'После генерации рейтинги должны быть пересчитаны.'
+        with pytest.raises(CommandError):
+            call_command('generate_dataset', **SCALE)
+
+    def test_02_csv(self, tmp_path):
+        from reviews.models import Review
+
+        call_command('generate_dataset', output_dir=str(tmp_path), **SCALE)
+        with open(tmp_path / 'review.csv', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert list(rows[0]) == [
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        ], 'Проверьте, что колонки совпадают с форматом `static/data`.'
+        assert len(rows) == SCALE['reviews']
+        assert len({(row['title_id'], row['author']) for row in rows}) == len(
+            rows
+        )
+        assert not Review.objects.exists(), (
+            'С `--output-dir` генератор не должен писать в базу.'
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Search:
+
+    def search(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?search=` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_ranked_search(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Дорога', year=2000, description='Путешествие через космос'
+        )
+        Title.objects.create(name='Космос', year=1980, description='Наука')
+        Title.objects.create(name='Сад', year=1990, description='Цветы')
+        assert self.search(client, 'космос') == ['Космос', 'Дорога'], (
+            'Проверьте, что поиск находит слово в названии и описании и '
+            'ставит совпадения по названию выше.'
+        )
+        assert self.search(client, 'КОСМ') == ['Космос', 'Дорога'], (
+            'Проверьте, что поиск не зависит от регистра и ищет по префиксу.'
+        )
+        assert self.search(client, 'космос наука') == ['Космос']
+        assert self.search(client, '"*(') == [], (
+            'Запрос без слов не должен приводить к ошибке.'
+        )
+
+    def test_02_index_follows_writes(self, client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Старое', year=2000)
+        Title.objects.filter(pk=title.pk).update(name='Новое')
+        assert self.search(client, 'старое') == []
+        assert self.search(client, 'новое') == ['Новое'], (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'произведения.'
+        )
+        Title.objects.bulk_create([Title(name='Пачка', year=2001)])
+        assert self.search(client, 'пачка') == ['Пачка']
+        Title.objects.all().delete()
+        assert self.search(client, 'новое') == []
+
+    def test_03_search_keeps_rank_with_cursor_default(self, client,
+                                                      settings):
+        from reviews.models import Title
+
+        Title.objects.create(name='Аааа', year=2000,
+                             description='Война и мир')
+        Title.objects.create(name='Яяя война', year=2000)
+        settings.CURSOR_PAGINATION_DEFAULT = True
+        assert self.search(client, 'война') == ['Яяя война', 'Аааа'], (
+            'Проверьте, что поиск сохраняет порядок по релевантности и при '
+            'курсорной пагинации по умолчанию.'
+        )
+        response = client.get(
+            '/api/v1/titles/', {'search': 'война', 'pagination': 'cursor'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что явный курсор вместе с поиском отклоняется.'
+        )
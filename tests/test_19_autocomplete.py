@@ -0,0 +1,122 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL = '/api/v1/autocomplete/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Autocomplete:
+
+    def suggest(self, client, **params):
+        response = client.get(URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{URL}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_prefix_and_popularity(self, client, admin, user, moderator):
+        from reviews.models import Category, Genre, Review, Title
+
+        category = Category.objects.create(name='Фильмы', slug='films')
+        genre = Genre.objects.create(name='Фантастика', slug='sci-fi')
+        quiet = Title.objects.create(name='Звездный путь', year=1966)
+        popular = Title.objects.create(
+            name='Звездные войны', year=1977, category=category
+        )
+        popular.genre.add(genre)
+        for author in (admin, user):
+            Review.objects.create(
+                title=popular, author=author, text='Текст', score=9
+            )
+
+        data = self.suggest(client, q='ЗВЕЗД')
+        assert [title['name'] for title in data['titles']] == [
+            popular.name, quiet.name
+        ], (
+            'Проверьте, что подсказки ищутся без учета регистра и '
+            'упорядочены по числу отзывов.'
+        )
+        assert data['genres'] == [] and data['categories'] == []
+        assert self.suggest(client, q='войн', type='titles') == {
+            'titles': [{'id': popular.id, 'name': popular.name}]
+        }, 'Проверьте, что подсказки находят слово внутри названия.'
+        assert self.suggest(client, q='фан')['genres'] == [
+            {'name': 'Фантастика', 'slug': 'sci-fi'}
+        ]
+
+        Review.objects.create(
+            title=quiet, author=moderator, text='Текст', score=5
+        )
+        Review.objects.create(title=quiet, author=admin, text='Текст', score=5)
+        Review.objects.create(title=quiet, author=user, text='Текст', score=5)
+        quiet.name = 'Звездный крейсер'
+        quiet.save()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.suggest(client, q='звезд', limit=1)
+        assert not queries.captured_queries, (
+            'Подсказки не должны обращаться к базе после сборки индекса.'
+        )
+        assert data['titles'] == [{'id': quiet.id, 'name': quiet.name}], (
+            'Проверьте, что индекс обновляется при записи отзывов и '
+            'произведений.'
+        )
+        popular.delete()
+        assert self.suggest(client, q='войн')['titles'] == []
+
+    def test_02_validation(self, client):
+        response = client.get(URL, {'q': 'а', 'limit': 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert self.suggest(client, q='') == {
+            'titles': [], 'genres': [], 'categories': []
+        }
+
+    def test_03_background_rebuild(self):
+        from api.autocomplete import Autocomplete
+        from reviews.models import Title
+
+        def wait_for(condition):
+            deadline = time.monotonic() + 5
+            while not condition():
+                assert time.monotonic() < deadline, 'Индекс не собрался.'
+                time.sleep(0.01)
+
+        def names(index):
+            return [title['name'] for title in
+                    index.search('стар', ['titles'], 10)['titles']]
+
+        Title.objects.create(name='Старт', year=2000)
+        index = Autocomplete()
+        index.start()
+        wait_for(lambda: index.indexes is not None)
+
+        loading, release = threading.Event(), threading.Event()
+        load = index.load
+
+        def slow_load():
+            loading.set()
+            release.wait(5)
+            return load()
+
+        index.load = slow_load
+        built = index.indexes
+        index.reset()
+        assert loading.wait(5)
+        with CaptureQueriesContext(connection) as queries:
+            assert names(index) == ['Старт'], (
+                'Проверьте, что во время пересборки подсказки отвечают '
+                'по старому индексу.'
+            )
+        assert not queries.captured_queries
+        index.title_saved(10 ** 6, 'Стартап', None)
+        release.set()
+        wait_for(lambda: index.indexes is not built)
+        assert names(index) == ['Старт', 'Стартап'], (
+            'Проверьте, что изменения во время пересборки попадают '
+            'в новый индекс.'
+        )
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Facets:
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        films = Category.objects.create(name='Фильмы', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        for name, year, category, genres in (
+            ('Первый фильм', 1994, films, (drama, comedy)),
+            ('Второй фильм', 1999, films, (drama,)),
+            ('Третий фильм', 2005, films, (comedy,)),
+            ('Книга', 1999, books, (drama,)),
+            ('Без категории', 2010, None, ()),
+        ):
+            title = Title.objects.create(
+                name=name, year=year, category=category
+            )
+            title.genre.set(genres)
+
+    def test_01_facets(self, client, titles, django_assert_max_num_queries):
+        # COUNT, страница, жанры страницы и один запрос фасетов.
+        with django_assert_max_num_queries(4):
+            response = client.get('/api/v1/titles/', {'facets': 'all'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['facets'] == {
+            'genre': {'drama': 3, 'comedy': 2},
+            'category': {'films': 3, 'books': 1},
+            'year': {'1990': 3, '2000': 1, '2010': 1},
+        }, (
+            'Проверьте, что `?facets=all` возвращает число произведений по '
+            'жанрам, категориям и десятилетиям одним запросом.'
+        )
+        response = client.get(
+            '/api/v1/titles/',
+            {'facets': 'genre,year', 'category': 'films', 'search': 'фильм'}
+        )
+        assert response.json()['facets'] == {
+            'genre': {'drama': 2, 'comedy': 2},
+            'year': {'1990': 2, '2000': 1},
+        }, 'Проверьте, что фасеты считаются по текущим фильтрам.'
+
+    def test_02_without_facets(self, client, titles):
+        response = client.get('/api/v1/titles/')
+        assert 'facets' not in response.json(), (
+            'Без параметра `facets` ответ не должен меняться.'
+        )
+        response = client.get('/api/v1/titles/', {'facets': 'rating'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+URL = '/api/v1/titles/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleFilters:
+
+    @pytest.fixture
+    def titles(self, admin, user):
+        from reviews.models import Category, Genre, Review, Title
+
+        films = Category.objects.create(name='Фильмы', slug='films')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        horror = Genre.objects.create(name='Ужасы', slug='horror')
+        for name, year, genres, scores in (
+            ('Драмеди', 1994, (drama, comedy), (8, 10)),
+            ('Драма', 1999, (drama,), (4,)),
+            ('Комедия', 2005, (comedy,), ()),
+            ('Ужастик', 2012, (horror, drama, comedy), (2,)),
+        ):
+            title = Title.objects.create(
+                name=name, year=year, category=films
+            )
+            title.genre.set(genres)
+            for author, score in zip((admin, user), scores):
+                Review.objects.create(
+                    title=title, author=author, text='Текст', score=score
+                )
+
+    def names(self, client, params):
+        response = client.get(URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{URL}` с параметрами {params} '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['count'] == len(data['results'])
+        return sorted(title['name'] for title in data['results'])
+
+    def test_01_genres(self, client, titles):
+        assert self.names(client, {'genre': 'drama,comedy'}) == [
+            'Драма', 'Драмеди', 'Комедия', 'Ужастик'
+        ], (
+            'Проверьте, что список жанров по умолчанию ищет произведения '
+            'хотя бы с одним из них и не дублирует строки.'
+        )
+        assert self.names(
+            client, {'genre': ['drama', 'comedy'], 'genre_match': 'all'}
+        ) == ['Драмеди', 'Ужастик'], (
+            'Проверьте, что `genre_match=all` требует все жанры.'
+        )
+        assert self.names(client, {'genre': 'horror'}) == ['Ужастик']
+
+    def test_02_ranges(self, client, titles):
+        assert self.names(client, {'year_min': 1999, 'year_max': 2005}) == [
+            'Драма', 'Комедия'
+        ], 'Проверьте фильтрацию по диапазону лет.'
+        assert self.names(client, {'rating_min': 4, 'rating_max': 9}) == [
+            'Драма', 'Драмеди'
+        ], 'Проверьте фильтрацию по диапазону рейтинга.'
+        assert self.names(client, {
+            'category': 'films', 'genre': 'drama', 'year_min': 2000
+        }) == ['Ужастик']
+        response = client.get(URL, {'genre_match': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22SparseFields:
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметрами {params} '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json(), [
+            query['sql'] for query in queries.captured_queries
+        ]
+
+    def test_01_titles(self, client, catalogue):
+        data, queries = self.get(
+            client, '/api/v1/titles/', {'fields': 'id,name,rating'}
+        )
+        assert set(data['results'][0]) == {'id', 'name', 'rating'}, (
+            'Проверьте, что `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert len(queries) == 2 and not any(
+            'description' in sql or 'reviews_genre' in sql
+            or 'reviews_category' in sql for sql in queries
+        ), (
+            'Проверьте, что `fields` убирает из запроса лишние столбцы, '
+            'соединение с категорией и предзагрузку жанров.'
+        )
+
+        data, _ = self.get(
+            client, f'/api/v1/titles/{catalogue["title"]}/',
+            {'fields': 'name,genre,category'}
+        )
+        assert set(data) == {'name', 'genre', 'category'}
+        assert data['category'] == catalogue['category'] and all(
+            isinstance(slug, str) for slug in data['genre']
+        ), 'Без `expand` связи должны отдаваться слагами.'
+
+        data, _ = self.get(
+            client, f'/api/v1/titles/{catalogue["title"]}/',
+            {'fields': 'name', 'expand': 'genre'}
+        )
+        assert set(data) == {'name', 'genre'}
+        assert set(data['genre'][0]) == {'name', 'slug'}, (
+            'Проверьте, что `expand` отдает связь вложенными объектами.'
+        )
+
+        data, _ = self.get(
+            client, '/api/v1/titles/',
+            {'fields': 'name', 'pagination': 'cursor'}
+        )
+        assert data['next'], 'Курсор должен строиться и при `fields`.'
+
+    def test_02_reviews_and_comments(self, client, catalogue):
+        title = catalogue['title']
+        data, queries = self.get(
+            client, f'/api/v1/titles/{title}/reviews/',
+            {'fields': 'id,score'}
+        )
+        assert set(data['results'][0]) == {'id', 'score'}
+        assert not any('reviews_customuser' in sql for sql in queries), (
+            'Без поля `author` отзывы не должны соединяться с авторами.'
+        )
+        data, _ = self.get(
+            client,
+            f'/api/v1/titles/{title}/reviews/{catalogue["review"]}/comments/',
+            {'fields': 'text,author'}
+        )
+        assert set(data['results'][0]) == {'text', 'author'}
+
+    def test_03_unknown_fields(self, client, catalogue):
+        for params in ({'fields': 'id,secret'}, {'fields': 'id',
+                                                 'expand': 'rating'}):
+            response = client.get('/api/v1/titles/', params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что неизвестные поля в `fields` и `expand` '
+                'возвращают ответ со статусом 400.'
+            )
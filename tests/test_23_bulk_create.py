@@ -0,0 +1,159 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkCreate:
+
+    @pytest.fixture
+    def catalogue(self):
+        from reviews.models import Category, Genre
+
+        Category.objects.create(name='Фильмы', slug='films')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+
+    def test_01_named(self, admin_client):
+        from reviews.models import Category, Genre
+
+        for url, model in (('/api/v1/categories/bulk/', Category),
+                           ('/api/v1/genres/bulk/', Genre)):
+            data = [{'name': f'Имя {index}', 'slug': f'slug-{index}'}
+                    for index in range(5)]
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.CREATED, (
+                f'Проверьте, что POST-запрос администратора к `{url}` '
+                'возвращает ответ со статусом 201.'
+            )
+            assert response.json() == data
+            assert model.objects.count() == 5, (
+                f'Проверьте, что POST-запрос к `{url}` создает все объекты.'
+            )
+
+    def test_02_titles(self, admin_client, catalogue):
+        from reviews.models import Title
+
+        url = '/api/v1/titles/bulk/'
+        data = [
+            {'name': 'Первое', 'year': 2000, 'category': 'films',
+             'genre': ['drama', 'comedy']},
+            {'name': 'Второе', 'year': 2001, 'category': 'films',
+             'genre': ['comedy']},
+        ]
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{url}` '
+            'возвращает ответ со статусом 201.'
+        )
+        result = response.json()
+        assert [title['name'] for title in result] == ['Первое', 'Второе']
+        assert all(title['id'] for title in result), (
+            'Проверьте, что в ответе указаны id созданных произведений.'
+        )
+        assert sorted(
+            genre['slug'] for genre in result[0]['genre']
+        ) == ['comedy', 'drama']
+        assert Title.objects.get(name='Первое').genre.count() == 2
+
+    def test_03_invalid_item(self, admin_client, catalogue):
+        from reviews.models import Genre, Title
+
+        url = '/api/v1/titles/bulk/'
+        data = [
+            {'name': 'Первое', 'year': 2000, 'category': 'films',
+             'genre': ['drama']},
+            {'name': 'Второе', 'year': 2001, 'category': 'films',
+             'genre': ['unknown']},
+        ]
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` с неизвестным жанром '
+            'возвращает ответ со статусом 400.'
+        )
+        errors = response.json()
+        assert len(errors) == 2 and errors[0] == {} and 'genre' in errors[1], (
+            'Проверьте, что ошибки возвращаются списком по элементам пачки.'
+        )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке в одном элементе не создается ничего.'
+        )
+
+        url = '/api/v1/genres/bulk/'
+        data = [{'name': 'Рок', 'slug': 'rock'},
+                {'name': 'Рок-н-ролл', 'slug': 'rock'},
+                {'name': 'Другая драма', 'slug': 'drama'}]
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert all('slug' in error for error in errors), (
+            'Проверьте, что занятые и повторяющиеся в пачке слаги '
+            'отмечаются ошибкой.'
+        )
+        assert Genre.objects.count() == 2
+
+    def test_04_limits(self, admin_client, user_client):
+        url = '/api/v1/genres/bulk/'
+        data = [{'name': 'Рок', 'slug': 'rock'}]
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос пользователя к `{url}` '
+            'возвращает ответ со статусом 403.'
+        )
+        response = admin_client.post(url, data=data[0], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` не со списком '
+            'возвращает ответ со статусом 400.'
+        )
+
+    def test_05_reserved_slug(self, admin_client):
+        from reviews.models import Category, Genre
+
+        for url, model in (('/api/v1/categories/', Category),
+                           ('/api/v1/genres/', Genre)):
+            data = {'name': 'Пачка', 'slug': 'bulk'}
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` со слагом `bulk` '
+                'возвращает ответ со статусом 400: такой объект нельзя '
+                'было бы удалить.'
+            )
+            response = admin_client.post(
+                f'{url}bulk/', data=[data], format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}bulk/` со слагом '
+                '`bulk` возвращает ответ со статусом 400.'
+            )
+            assert not model.objects.exists()
+
+    def test_06_titles_without_returned_keys(self, admin_client, catalogue,
+                                             monkeypatch):
+        from reviews.models import Title
+
+        # СУБД, которая не возвращает ключи из bulk_create и не SQLite.
+        mysql = SimpleNamespace(vendor='mysql', features=SimpleNamespace(
+            can_return_rows_from_bulk_insert=False
+        ))
+        monkeypatch.setattr(
+            'api.serializers.connections', {'default': mysql}
+        )
+        data = [
+            {'name': 'Первое', 'year': 2000, 'category': 'films',
+             'genre': ['drama']},
+            {'name': 'Второе', 'year': 2001, 'category': 'films',
+             'genre': ['comedy']},
+        ]
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        for item in data:
+            title = Title.objects.get(name=item['name'])
+            assert [genre.slug for genre in title.genre.all()] == (
+                item['genre']
+            ), (
+                'Проверьте, что без ключей из bulk_create жанры '
+                'привязываются к своим произведениям.'
+            )
@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+FILES = {
+    'users': 'users.csv',
+    'categories': 'category.csv',
+    'genres': 'genre.csv',
+    'titles': 'titles.csv',
+    'genre_titles': 'genre_title.csv',
+    'reviews': 'review.csv',
+    'comments': 'comments.csv',
+}
+
+
+def read_csv(content, skip_ids=()):
+    """Заголовок и строки по id; pub_date при загрузке проставляется заново."""
+    header, *rows = csv.reader(io.StringIO(content))
+    keep = [index for index, column in enumerate(header)
+            if column != 'pub_date']
+    return [header[index] for index in keep], sorted(
+        ([row[index] for index in keep] for row in rows
+         if row[0] not in skip_ids),
+        key=lambda row: int(row[0])
+    )
+
+
+async def asgi_get(path, token):
+    """GET через ASGIHandler, как под uvicorn: тело отдается в цикле."""
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+        'headers': [(b'authorization', f'Bearer {token}'.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await ASGIHandler()(scope, receive, send)
+    return messages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Export:
+
+    def test_01_csv_matches_loader_files(self, django_user_model, tmp_path):
+        call_command(
+            'csv_loader', checkpoint=str(tmp_path / 'checkpoint.json')
+        )
+        admin = django_user_model.objects.create(
+            username='exporter', email='exporter@yamdb.fake', role='admin'
+        )
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+        for dataset, csv_file in FILES.items():
+            url = f'/api/v1/export/{dataset}/?format=csv'
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос администратора к `{url}` '
+                'возвращает ответ со статусом 200.'
+            )
+            assert response.streaming, (
+                'Проверьте, что выгрузка отдается потоковым ответом.'
+            )
+            assert response['Content-Type'].startswith('text/csv')
+            assert f'filename="{csv_file}"' in response[
+                'Content-Disposition'
+            ], (
+                f'Проверьте, что файл выгрузки `{dataset}` называется '
+                f'`{csv_file}`, как его читает csv_loader.'
+            )
+            exported = read_csv(
+                b''.join(response.streaming_content).decode(),
+                skip_ids={str(admin.pk)} if dataset == 'users' else ()
+            )
+            path = settings.BASE_DIR / 'static' / 'data' / csv_file
+            with open(path, encoding='utf-8') as file:
+                expected = read_csv(file.read())
+            assert exported == expected, (
+                f'Проверьте, что выгрузка `{dataset}` совпадает '
+                f'по столбцам и строкам с файлом `{csv_file}`.'
+            )
+
+    def test_02_ndjson_chunks(self, admin_client, settings):
+        from reviews.models import Genre
+
+        settings.EXPORT_CHUNK_SIZE = 2
+        for index in range(5):
+            Genre.objects.create(name=f'Жанр {index}', slug=f'genre-{index}')
+        response = admin_client.get('/api/v1/export/genres/')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('application/x-ndjson'), (
+            'Проверьте, что по умолчанию выгрузка отдается в NDJSON.'
+        )
+        chunks = list(response.streaming_content)
+        assert len(chunks) == 3, (
+            'Проверьте, что строки отдаются пачками по EXPORT_CHUNK_SIZE.'
+        )
+        lines = b''.join(chunks).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {'id': genre.pk, 'name': genre.name, 'slug': genre.slug}
+            for genre in Genre.objects.order_by('pk')
+        ]
+
+    def test_03_access(self, client, user_client, admin_client):
+        url = '/api/v1/export/titles/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        response = admin_client.get('/api/v1/export/unknown/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_asgi(self, token_admin):
+        from reviews.models import Genre
+
+        Genre.objects.create(name='Драма', slug='drama')
+        messages = async_to_sync(asgi_get)(
+            '/api/v1/export/genres/', token_admin['access']
+        )
+        assert messages[0]['status'] == HTTPStatus.NOT_IMPLEMENTED, (
+            'Проверьте, что под ASGI выгрузка отвечает 501: Django 3.2 '
+            'отдает потоковое тело в цикле событий, где запросы к базе '
+            'запрещены.'
+        )
+        assert not messages[-1].get('more_body'), (
+            'Проверьте, что ответ выгрузки под ASGI отдается целиком.'
+        )
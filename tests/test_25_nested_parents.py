@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25NestedParents:
+
+    @pytest.fixture
+    def reviews(self, admin, user):
+        from reviews.models import Comment, Review, Title
+
+        titles = [Title.objects.create(name=f'Произведение {index}', year=2000)
+                  for index in range(2)]
+        review = Review.objects.create(
+            title=titles[0], author=admin, text='Отзыв', score=5
+        )
+        comment = Comment.objects.create(
+            review=review, author=user, text='Комментарий'
+        )
+        return titles, review, comment
+
+    def test_01_empty_list_and_missing_parent(self, client, reviews):
+        titles, review, _ = reviews
+        url = f'/api/v1/titles/{titles[1].pk}/reviews/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что список отзывов произведения без отзывов '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.json()['results'] == []
+        for url in (
+            '/api/v1/titles/0/reviews/',
+            f'/api/v1/titles/{titles[0].pk}/reviews/0/comments/',
+            f'/api/v1/titles/{titles[1].pk}/reviews/{review.pk}/comments/',
+        ):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с несуществующей '
+                'цепочкой родителей возвращает ответ со статусом 404.'
+            )
+
+    def test_02_detail_checks_whole_chain(self, client, user_client,
+                                          reviews):
+        titles, review, comment = reviews
+        url = (f'/api/v1/titles/{titles[1].pk}/reviews/{review.pk}/'
+               f'comments/{comment.pk}/')
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий не находится по чужому произведению.'
+        )
+        url = f'/api/v1/titles/{titles[1].pk}/reviews/{review.pk}/'
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+        response = user_client.post(url + 'comments/', data={'text': 'Нет'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий нельзя оставить к отзыву '
+            'через чужое произведение.'
+        )
+
+    def test_03_single_review_per_title(self, admin_client, user_client,
+                                        reviews):
+        titles, *_ = reviews
+        url = f'/api/v1/titles/{titles[0].pk}/reviews/'
+        data = {'text': 'Еще отзыв', 'score': 3}
+        response = admin_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что второй отзыв автора на произведение '
+            'отклоняется со статусом 400.'
+        )
+        assert user_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        response = user_client.post('/api/v1/titles/0/reviews/', data=data)
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,147 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def token_for(user):
+    from api.authentication import access_token_for
+
+    return str(access_token_for(user))
+
+
+def client_for(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26StatelessJWT:
+
+    def test_01_claims_without_queries(self, admin,
+                                       django_assert_num_queries):
+        token = token_for(admin)
+        payload = AccessToken(token).payload
+        assert (payload['user_id'], payload['username'], payload['role'],
+                payload['is_staff']) == (admin.pk, admin.username, 'admin',
+                                         False), (
+            'Проверьте, что токен содержит id, username, role и is_staff.'
+        )
+        admin_client = client_for(token)
+        with django_assert_num_queries(0):
+            response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что права администратора берутся из claims токена '
+            'без запроса пользователя к базе.'
+        )
+        response = admin_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == admin.email, (
+            'Проверьте, что профиль отдает все поля пользователя.'
+        )
+
+    def test_02_revocation(self, admin_client, user):
+        token = token_for(user)
+        user_client = client_for(token)
+        assert user_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        user_client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что поля вне claims не отзывают токен.'
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что смена роли отзывает выданные токены.'
+        user.refresh_from_db()
+        token = token_for(user)
+        assert client_for(token).get('/api/v1/metrics/').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что новый токен несет новую роль.'
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert client_for(token).get('/api/v1/titles/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что токены удаленного пользователя отозваны.'
+
+    def test_03_token_without_claims(self, admin):
+        admin_client = client_for(AccessToken.for_user(admin))
+        assert admin_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что токены без claims проверяются по базе.'
+
+    def test_04_revocation_outlives_caches(self, admin_client, user):
+        from api.authentication import token_versions
+
+        user_client = client_for(token_for(user))
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        for cache in caches.all():
+            cache.clear()
+        token_versions.reset()
+        assert user_client.get('/api/v1/titles/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что отзыв токенов хранится в базе и не пропадает '
+            'при очистке или вытеснении кеша.'
+        )
+
+    def test_05_bulk_update_revokes(self, django_user_model, tmp_path):
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        call_command('csv_loader', checkpoint=checkpoint)
+        django_user_model.objects.filter(username='bingobongo').update(
+            role='admin'
+        )
+        user = django_user_model.objects.get(username='bingobongo')
+        admin_client = client_for(token_for(user))
+        assert admin_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.OK
+        )
+        call_command(
+            'csv_loader', mode='upsert', tables=['users'],
+            checkpoint=checkpoint
+        )
+        assert admin_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что смена роли при `csv_loader --mode=upsert` '
+            'отзывает выданные токены.'
+        )
+
+    def test_06_inactive_user(self, user):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        data = {'text': 'Отзыв', 'score': 5}
+        user_client = client_for(token_for(user))
+        user.is_active = False
+        user.confirmation_code = 'inactive-code'
+        user.save()
+        assert user_client.post(url, data=data).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что деактивация отзывает выданные токены.'
+
+        response = APIClient().post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': 'inactive-code'
+        })
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что неактивный пользователь не получает токен.'
+        )
+        user.refresh_from_db()
+        token = AccessToken.for_user(user)
+        for claim in ('username', 'role', 'is_staff', 'is_active',
+                      'token_version'):
+            token[claim] = getattr(user, claim)
+        assert client_for(token).post(url, data=data).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что токен неактивного пользователя отклоняется.'
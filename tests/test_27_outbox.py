@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+URL = '/api/v1/auth/signup/'
+
+
+class FlakyBackend(EmailBackend):
+    """Почтовый бэкенд, отказывающий на первых письмах."""
+    failures = 0
+
+    def send_messages(self, messages):
+        if FlakyBackend.failures:
+            FlakyBackend.failures -= 1
+            raise ConnectionError('Почтовый сервер недоступен')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Outbox:
+
+    @pytest.fixture(autouse=True)
+    def outbox(self, settings):
+        settings.EMAIL_OUTBOX = True
+
+    def signup(self, client, username):
+        response = client.post(URL, data={
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_signup_enqueues(self, client):
+        from reviews.models import OutboxEmail
+
+        outbox_before_count = len(mail.outbox)
+        for index in range(3):
+            self.signup(client, f'user{index}')
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{URL}` не отправляет письмо '
+            'в запросе, а ставит его в очередь.'
+        )
+        assert OutboxEmail.objects.filter(sent_at=None).count() == 3
+
+        call_command('send_outbox', once=True, workers=2, batch_size=2)
+        assert sorted(
+            message.to[0] for message in mail.outbox[outbox_before_count:]
+        ) == [f'user{index}@yamdb.fake' for index in range(3)], (
+            'Проверьте, что `send_outbox` отправляет все письма очереди.'
+        )
+        assert not OutboxEmail.objects.filter(sent_at=None).exists()
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before_count + 3, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retry_with_backoff(self, client, settings):
+        from reviews.models import OutboxEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_27_outbox.FlakyBackend'
+        FlakyBackend.failures = 1
+        self.signup(client, 'flaky')
+        call_command('send_outbox', once=True, backoff=60)
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is None and email.attempts == 1, (
+            'Проверьте, что неудачная отправка учитывается как попытка.'
+        )
+        assert 'ConnectionError' in email.last_error
+        call_command('send_outbox', once=True, backoff=60)
+        email.refresh_from_db()
+        assert email.attempts == 1, (
+            'Проверьте, что до истечения задержки письмо не отправляется.'
+        )
+
+        OutboxEmail.objects.update(send_after=email.created)
+        call_command('send_outbox', once=True, backoff=60)
+        email.refresh_from_db()
+        assert email.sent_at is not None, (
+            'Проверьте, что письмо отправляется повторно после задержки.'
+        )
+
+        FlakyBackend.failures = 10
+        self.signup(client, 'unlucky')
+        call_command('send_outbox', once=True, backoff=0, max_attempts=3)
+        email = OutboxEmail.objects.get(recipient='unlucky@yamdb.fake')
+        assert email.attempts == 3 and email.sent_at is None, (
+            'Проверьте, что после max_attempts попыток письмо больше '
+            'не отправляется.'
+        )
+        FlakyBackend.failures = 0
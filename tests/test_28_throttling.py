@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Throttling:
+
+    @pytest.mark.parametrize('storage', ('local', 'cache'))
+    def test_01_signup_by_ip_and_username(self, client, settings, storage):
+        settings.API_THROTTLE_STORAGE = storage
+        settings.API_THROTTLE_RATES = {'auth': '3/min'}
+        url = '/api/v1/auth/signup/'
+        for index in range(3):
+            response = client.post(url, data={
+                'username': 'bot', 'email': 'bot@yamdb.fake'
+            })
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(url, data={
+            'username': 'bot', 'email': 'bot@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация сверх лимита возвращает ответ '
+            'со статусом 429.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 сообщает, сколько ждать.'
+        )
+        response = client.post(
+            url, data={'username': 'other', 'email': 'other@yamdb.fake'},
+            REMOTE_ADDR='10.0.0.1'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит IP не действует на другие адреса.'
+        )
+        response = client.post(
+            '/api/v1/auth/token/',
+            data={'username': 'bot', 'confirmation_code': 1},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы токена ограничены и по имени '
+            'пользователя, с любого адреса.'
+        )
+
+    def test_02_writes_only(self, admin_client, settings):
+        from reviews.models import Title
+
+        settings.API_THROTTLE_RATES = {'write': '1/min'}
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = admin_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        review = response.json()['id']
+        response = admin_client.post(
+            f'{url}{review}/comments/', data={'text': 'Комментарий'}
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что отзывы и комментарии делят лимит изменений.'
+        )
+        for _ in range(3):
+            assert admin_client.get(url).status_code == HTTPStatus.OK, (
+                'Проверьте, что чтение отзывов не ограничено.'
+            )
+
+    def test_03_forwarded_for_is_not_trusted(self, client, settings):
+        settings.API_THROTTLE_RATES = {'auth': '1/min'}
+        url = '/api/v1/auth/signup/'
+        response = client.post(
+            url, data={'username': 'bot', 'email': 'bot@yamdb.fake'},
+            HTTP_X_FORWARDED_FOR='10.0.0.1'
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.post(
+            url, data={'username': 'other', 'email': 'other@yamdb.fake'},
+            HTTP_X_FORWARDED_FOR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подмена X-Forwarded-For не дает клиенту '
+            'нового ведра: IP берется из REMOTE_ADDR.'
+        )
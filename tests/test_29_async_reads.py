@@ -0,0 +1,67 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, AsyncRequestFactory
+
+from tests.utils import create_reviews, create_titles
+
+
+def call(view, request, **kwargs):
+    response = async_to_sync(view)(request, **kwargs)
+    return response.render()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29AsyncReads:
+
+    def test_01_async_views(self, client, admin_client, admin, settings):
+        from api.views import ReviewViewSet, TitleViewSet
+
+        settings.API_ASYNC_READS = True
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        factory = AsyncRequestFactory()
+
+        view = TitleViewSet.as_view({'get': 'list', 'post': 'create'})
+        assert asyncio.iscoroutinefunction(view), (
+            'Проверьте, что при API_ASYNC_READS список произведений '
+            'отдается async-вью.'
+        )
+        response = call(view, factory.get('/api/v1/titles/'))
+        assert response.status_code == HTTPStatus.OK
+        assert response.data == client.get('/api/v1/titles/').json(), (
+            'Проверьте, что async-вью отдает тот же список произведений.'
+        )
+        response = call(view, factory.post('/api/v1/titles/', {}))
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменяющие запросы проходят обычные проверки.'
+        )
+
+        view = ReviewViewSet.as_view({'get': 'retrieve'})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        response = call(view, factory.get(url), title_id=titles[0]['id'],
+                        pk=reviews[0]['id'])
+        assert response.data == client.get(url).json(), (
+            'Проверьте, что async-вью отдает тот же отзыв.'
+        )
+
+        settings.API_ASYNC_READS = False
+        view = TitleViewSet.as_view({'get': 'list'})
+        assert not asyncio.iscoroutinefunction(view), (
+            'Проверьте, что без API_ASYNC_READS вью остаются синхронными.'
+        )
+
+    def test_02_metrics_under_asgi(self, admin_client):
+        from api.metrics import registry
+
+        create_titles(admin_client)
+        registry.reset()
+        response = async_to_sync(AsyncClient().get)('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        titles = registry.report()['api:titles-list']['GET']
+        assert titles['queries']['p50'] > 0, (
+            'Проверьте, что под ASGI замеры считают SQL-запросы.'
+        )